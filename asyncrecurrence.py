@@ -0,0 +1,90 @@
+import itertools
+import time
+import recurrence
+
+try:
+	import asyncio
+except ImportError:
+	asyncio = None
+
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+def _require_asyncio():
+	if asyncio is None:
+		raise ImportError('asyncio is required for the asynchronous generators')
+
+
+def generate(rec, first_occurrence_number=0, direction=recurrence.FUTURE, batch_size=None, yield_every=100, time_slice=None):
+	return AsyncOccurrenceIterator(rec.generate(first_occurrence_number, direction), batch_size, yield_every, time_slice)
+
+
+def generate_after(rec, date, before=None, with_numbers=False, batch_size=None, yield_every=100, time_slice=None):
+	return AsyncOccurrenceIterator(rec.generate_after(date, before, with_numbers), batch_size, yield_every, time_slice)
+
+
+def _batches(iterator, batch_size):
+	while True:
+		batch = list(itertools.islice(iterator, batch_size))
+		if not batch:
+			return
+		yield batch
+
+
+class AsyncOccurrenceIterator(object):
+	
+	def __init__(self, iterator, batch_size=None, yield_every=100, time_slice=None):
+		_require_asyncio()
+		if batch_size is not None:
+			if batch_size < 1:
+				raise ValueError('Invalid batch size: ' + repr(batch_size))
+			iterator = _batches(iterator, batch_size)
+		self._iterator = iterator
+		self._batched = batch_size is not None
+		self._yield_every = yield_every
+		self._time_slice = time_slice
+		self._count = 0
+		self._slice_start = None
+	
+	def __aiter__(self):
+		return self
+	
+	def __anext__(self):
+		try:
+			item = next(self._iterator)
+		except StopIteration:
+			raise StopAsyncIteration
+		
+		# Items are handed over without suspending, except every yield_every
+		# occurrences or time_slice seconds, when control goes back to the loop.
+		# The time slice starts when the iteration does, not when the iterator
+		# is created.
+		if self._slice_start is None:
+			self._slice_start = _clock()
+		self._count += len(item) if self._batched else 1
+		if (self._yield_every is not None and self._count >= self._yield_every
+				or self._time_slice is not None and _clock() - self._slice_start >= self._time_slice):
+			self._count = 0
+			self._slice_start = _clock()
+			return asyncio.sleep(0, result=item)
+		return _Ready(item)
+
+
+class _Ready(object):
+	
+	__slots__ = ('value',)
+	
+	def __init__(self, value):
+		self.value = value
+	
+	def __await__(self):
+		return self
+	
+	def __iter__(self):
+		return self
+	
+	def __next__(self):
+		raise StopIteration(self.value)
+	
+	next = __next__
@@ -0,0 +1,59 @@
+# Measures how expanding a rule population over a 24-month horizon scales
+# with the number of worker processes.
+#
+# Usage: python benchmarks/bench_expansion.py [count] [max workers] [chunk size]
+
+import multiprocessing
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from yearmonth import YearMonth
+from ruletable import RuleTable
+import expansion
+import recurrence
+
+
+def make_recurrences(count):
+	recurrences = []
+	for i in range(count):
+		if i % 3 == 0:
+			recurrences.append(recurrence.DaysBasedRecurrence(date(2012, 1, 1) + timedelta(days=i % 1000), i % 30 + 1))
+		elif i % 3 == 1:
+			recurrences.append(recurrence.MonthsBasedRecurrence(YearMonth(2012, i % 12 + 1), i % 6 + 1, i % 28 + 1))
+		else:
+			recurrences.append(recurrence.MonthsBasedRecurrence(YearMonth(2012, i % 12 + 1), i % 6 + 1, -(i % 4 + 1), i % 7))
+	return recurrences
+
+
+def expansion_time(rules, start, end, workers, chunk_size):
+	began = time.time()
+	for chunk in expansion.expand(rules, start, end, workers=workers, chunk_size=chunk_size):
+		pass
+	return time.time() - began
+
+
+def main(count, max_workers, chunk_size):
+	table = RuleTable.from_recurrences(make_recurrences(count))
+	start = date(2013, 1, 1)
+	end = date(2015, 1, 1)
+	
+	print('%d rules, %d per chunk, %d CPUs' % (count, chunk_size, multiprocessing.cpu_count()))
+	print('%8s %12s %10s' % ('workers', 'seconds', 'speedup'))
+	baseline = None
+	for workers in range(1, max_workers + 1):
+		seconds = expansion_time(table, start, end, workers, chunk_size)
+		if baseline is None:
+			baseline = seconds
+		print('%8d %12.2f %10.2f' % (workers, seconds, baseline / seconds))
+
+
+if __name__ == '__main__':
+	main(
+		int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+		int(sys.argv[2]) if len(sys.argv) > 2 else multiprocessing.cpu_count(),
+		int(sys.argv[3]) if len(sys.argv) > 3 else 1000,
+	)
@@ -0,0 +1,80 @@
+# Measures pickle size and speed of large rule lists, against the previous
+# reduction of the recurrence classes, reproduced below.
+#
+# Usage: python benchmarks/bench_pickle.py [count]
+
+import os
+import sys
+import timeit
+from datetime import date, timedelta
+
+try:
+	import cPickle as pickle
+except ImportError:
+	import pickle
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from yearmonth import YearMonth
+from ruletable import RuleTable
+import recurrence
+
+
+class LegacyDaysBasedRecurrence(recurrence.DaysBasedRecurrence):
+	
+	__slots__ = ()
+	
+	def __reduce__(self):
+		return (recurrence.DaysBasedRecurrence, (self.anchor, self.period))
+
+
+class LegacyMonthsBasedRecurrence(recurrence.MonthsBasedRecurrence):
+	
+	__slots__ = ()
+	
+	def __reduce__(self):
+		return (recurrence.MonthsBasedRecurrence, (self.anchor, self.period, self.ordinal, self.day))
+
+
+def make_recurrences(count, days_based_class, months_based_class):
+	recurrences = []
+	for i in range(count):
+		if i % 3 == 0:
+			recurrences.append(days_based_class(date(2012, 1, 1) + timedelta(days=i % 1000), i % 30 + 1))
+		elif i % 3 == 1:
+			recurrences.append(months_based_class(YearMonth(2012 + i % 100, i % 12 + 1), i % 12 + 1, i % 28 + 1))
+		else:
+			recurrences.append(months_based_class(YearMonth(2012 + i % 100, i % 12 + 1), i % 6 + 1, -(i % 4 + 1), i % 7))
+	return recurrences
+
+
+def best_time(function):
+	return min(timeit.repeat(function, number=1, repeat=3))
+
+
+def measure(rules):
+	data = pickle.dumps(rules, pickle.HIGHEST_PROTOCOL)
+	return (
+		len(data),
+		best_time(lambda: pickle.dumps(rules, pickle.HIGHEST_PROTOCOL)),
+		best_time(lambda: pickle.loads(data)),
+	)
+
+
+def main(count):
+	legacy = make_recurrences(count, LegacyDaysBasedRecurrence, LegacyMonthsBasedRecurrence)
+	current = make_recurrences(count, recurrence.DaysBasedRecurrence, recurrence.MonthsBasedRecurrence)
+	assert pickle.loads(pickle.dumps(current, pickle.HIGHEST_PROTOCOL)) == current
+	
+	print('%-24s %14s %14s %14s' % ('%d rules' % count, 'bytes/rule', 'ns/rule dump', 'ns/rule load'))
+	for name, rules in [
+		('previous reduce', legacy),
+		('current reduce', current),
+		('RuleTable', RuleTable.from_recurrences(current)),
+	]:
+		size, dump_time, load_time = measure(rules)
+		print('%-24s %14.1f %14.0f %14.0f' % (name, float(size) / count, dump_time / count * 1e9, load_time / count * 1e9))
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
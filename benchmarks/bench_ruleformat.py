@@ -0,0 +1,57 @@
+# Measures the per-rule cost of the binary rule format against pickle.
+#
+# Usage: python benchmarks/bench_ruleformat.py [count]
+
+import os
+import sys
+import timeit
+import pickle
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from yearmonth import YearMonth
+from ruletable import RuleTable
+import ruleformat
+import recurrence
+
+
+def make_recurrences(count):
+	recurrences = []
+	for i in range(count):
+		if i % 2 == 0:
+			recurrences.append(recurrence.DaysBasedRecurrence(date(2012, 1, 1) + timedelta(days=i % 1000), i % 30 + 1))
+		else:
+			recurrences.append(recurrence.MonthsBasedRecurrence(YearMonth(2012, i % 12 + 1), i % 6 + 1, -(i % 4 + 1), i % 7))
+	return recurrences
+
+
+def per_rule_ns(function, count):
+	return min(timeit.repeat(function, number=1, repeat=3)) / count * 1e9
+
+
+def main(count):
+	recurrences = make_recurrences(count)
+	table = RuleTable.from_recurrences(recurrences)
+	data = ruleformat.encode_many(table)
+	pickled = pickle.dumps(recurrences, pickle.HIGHEST_PROTOCOL)
+	
+	print('%-36s %12s' % ('operation', 'ns/rule'))
+	rows = [
+		('encode_many(list)',           lambda: ruleformat.encode_many(recurrences)),
+		('encode_many(RuleTable)',      lambda: ruleformat.encode_many(table)),
+		('decode_table(bytes)',         lambda: ruleformat.decode_table(data)),
+		('decode_many(bytes)',          lambda: ruleformat.decode_many(data)),
+		('pickle.dumps(list)',          lambda: pickle.dumps(recurrences, pickle.HIGHEST_PROTOCOL)),
+		('pickle.loads(list)',          lambda: pickle.loads(pickled)),
+	]
+	for name, function in rows:
+		print('%-36s %12.1f' % (name, per_rule_ns(function, count)))
+	
+	print('')
+	print('%-36s %12.1f' % ('binary bytes/rule', float(len(data)) / count))
+	print('%-36s %12.1f' % ('pickle bytes/rule', float(len(pickled)) / count))
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,110 @@
+# Compares per-instance memory and construction time of the slotted
+# YearMonth and recurrence classes against the previous __dict__-based
+# implementation, reproduced below.
+#
+# Usage: python benchmarks/bench_slots.py [count]
+
+import os
+import sys
+import timeit
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from yearmonth import YearMonth
+import recurrence
+
+
+class LegacyYearMonth(object):
+	def __init__(self, year, month):
+		if month < 1 or month > 12:
+			raise ValueError('Invalid month: ' + str(month))
+		
+		self.year = year
+		self.month = month
+	
+	def __setattr__(self, attr, value):
+		if attr in ('year', 'month') and hasattr(self, attr):
+			raise AttributeError('Attribute ' + attr + ' cannot be set')
+		return super(LegacyYearMonth, self).__setattr__(attr, value)
+
+
+class LegacyDaysBasedRecurrence(object):
+	
+	def __init__(self, anchor, period):
+		if not isinstance(anchor, date):
+			raise ValueError('Invalid anchor instance: ' + repr(anchor))
+		
+		self.anchor = anchor
+		self.period = period
+	
+	def __setattr__(self, attr, value):
+		if attr in ('anchor', 'period') and hasattr(self, attr):
+			raise AttributeError('Attribute ' + attr + ' cannot be set')
+		return super(LegacyDaysBasedRecurrence, self).__setattr__(attr, value)
+
+
+class LegacyMonthsBasedRecurrence(object):
+	
+	def __init__(self, anchor, period, ordinal, day=recurrence.DAY_OF_MONTH):
+		if not isinstance(anchor, LegacyYearMonth):
+			raise ValueError('Invalid anchor instance: ' + repr(anchor))
+		
+		if day not in (recurrence.DAY_OF_MONTH, 0, 1, 2, 3, 4, 5, 6):
+			raise ValueError('Invalid day: ' + repr(day))
+		
+		self.anchor = anchor
+		self.period = period
+		self.ordinal = ordinal
+		self.day = day
+	
+	def __setattr__(self, attr, value):
+		if attr in ('anchor', 'period', 'ordinal', 'day') and hasattr(self, attr):
+			raise AttributeError('Attribute ' + attr + ' cannot be set')
+		return super(LegacyMonthsBasedRecurrence, self).__setattr__(attr, value)
+
+
+def instance_size(instance):
+	size = sys.getsizeof(instance)
+	if hasattr(instance, '__dict__'):
+		size += sys.getsizeof(instance.__dict__)
+	return size
+
+
+def construction_time(factory, count):
+	return min(timeit.repeat(factory, number=count, repeat=5)) / count
+
+
+CASES = [
+	('YearMonth',
+		lambda: LegacyYearMonth(2012, 4),
+		lambda: YearMonth(2012, 4),
+	),
+	('YearMonth (not interned)',
+		lambda: LegacyYearMonth(2512, 4),
+		lambda: YearMonth(2512, 4),
+	),
+	('DaysBasedRecurrence',
+		lambda: LegacyDaysBasedRecurrence(date(2012, 4, 7), 3),
+		lambda: recurrence.DaysBasedRecurrence(date(2012, 4, 7), 3),
+	),
+	('MonthsBasedRecurrence',
+		lambda: LegacyMonthsBasedRecurrence(LegacyYearMonth(2012, 4), 3, -2, recurrence.TUESDAY),
+		lambda: recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 3, -2, recurrence.TUESDAY),
+	),
+]
+
+
+def main(count):
+	print('%-26s %14s %14s %16s %16s' % ('class', 'bytes before', 'bytes after', 'ns/new before', 'ns/new after'))
+	for name, legacy, current in CASES:
+		print('%-26s %14d %14d %16.0f %16.0f' % (name,
+				instance_size(legacy()),
+				instance_size(current()),
+				construction_time(legacy, count) * 1e9,
+				construction_time(current, count) * 1e9,
+			))
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
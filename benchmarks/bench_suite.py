@@ -0,0 +1,136 @@
+# Times the public hot paths of the recurrence classes and YearMonth, writes
+# the results as JSON and optionally flags regressions against a baseline
+# produced by an earlier run.
+#
+# Usage: python benchmarks/bench_suite.py [--output FILE] [--compare BASELINE]
+#                                          [--threshold FRACTION] [--filter TEXT]
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import timeit
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from yearmonth import YearMonth
+import recurrence
+
+
+RECURRENCES = [
+	('days', recurrence.DaysBasedRecurrence(date(2012, 4, 7), 3)),
+	('day_of_month+', recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 3, 7)),
+	('day_of_month-', recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 3, -7)),
+	('weekday+', recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 4, 2, recurrence.TUESDAY)),
+	('weekday-', recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 4, -1, recurrence.SATURDAY)),
+]
+
+# Number of occurrences pulled from the generators in each timed call
+GENERATED = 100
+
+MIN_TIME = 0.05
+REPEAT = 5
+
+
+def recurrence_cases():
+	cases = []
+	for name, rec in RECURRENCES:
+		occurrence = rec.get_occurrence(50)
+		after = date(2016, 5, 17)
+		cases.extend([
+			(name + '.get_occurrence', lambda rec=rec: rec.get_occurrence(50)),
+			(name + '.is_occurrence', lambda rec=rec, occurrence=occurrence: rec.is_occurrence(occurrence)),
+			(name + '.get_occurrence_number', lambda rec=rec, occurrence=occurrence: rec.get_occurrence_number(occurrence)),
+			(name + '.get_occurrence_after', lambda rec=rec, after=after: rec.get_occurrence_after(after)),
+			(name + '.generate', lambda rec=rec: list(itertools.islice(rec.generate(), GENERATED))),
+			(name + '.generate_after', lambda rec=rec, after=after: list(itertools.islice(rec.generate_after(after), GENERATED))),
+		])
+	return cases
+
+
+def yearmonth_cases():
+	ym = YearMonth(2012, 4)
+	other = YearMonth(2009, 11)
+	day = date(2012, 4, 7)
+	return [
+		('YearMonth.new', lambda: YearMonth(2012, 4)),
+		('YearMonth.new_not_interned', lambda: YearMonth(2512, 4)),
+		('YearMonth.from_date', lambda: YearMonth.from_date(day)),
+		('YearMonth.from_string', lambda: YearMonth.from_string('2012-04')),
+		('YearMonth.add', lambda: ym + 7),
+		('YearMonth.subtract', lambda: ym - other),
+		('YearMonth.to_ordinal', lambda: ym.to_ordinal()),
+	]
+
+
+def time_case(function):
+	number = 1
+	while True:
+		elapsed = timeit.timeit(function, number=number)
+		if elapsed >= MIN_TIME:
+			break
+		number *= 2
+	return min(timeit.repeat(function, number=number, repeat=REPEAT)) / number
+
+
+def run(text_filter):
+	results = {}
+	for name, function in recurrence_cases() + yearmonth_cases():
+		if text_filter and text_filter not in name:
+			continue
+		results[name] = time_case(function)
+		print('%-40s %12.0f ns' % (name, results[name] * 1e9))
+	return {
+		'python': platform.python_version(),
+		'implementation': platform.python_implementation(),
+		'results': results,
+	}
+
+
+def compare(report, baseline, threshold):
+	print('')
+	if baseline.get('python') != report['python']:
+		print('Warning: the baseline was recorded with Python %s' % baseline.get('python'))
+	print('%-40s %12s %12s %9s' % ('compared to baseline', 'baseline ns', 'current ns', 'change'))
+	regressions = []
+	for name in sorted(report['results']):
+		if name not in baseline['results']:
+			continue
+		before = baseline['results'][name]
+		after = report['results'][name]
+		change = after / before - 1
+		flag = ''
+		if change > threshold:
+			flag = '  REGRESSION'
+			regressions.append(name)
+		print('%-40s %12.0f %12.0f %+8.1f%%%s' % (name, before * 1e9, after * 1e9, change * 100, flag))
+	return regressions
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark the recurrence hot paths.')
+	parser.add_argument('--output', help='write the results as JSON to this file')
+	parser.add_argument('--compare', metavar='BASELINE', help='compare against the JSON results of an earlier run')
+	parser.add_argument('--threshold', type=float, default=0.10, help='slowdown fraction flagged as a regression (default 0.10)')
+	parser.add_argument('--filter', help='only run the cases whose name contains this text')
+	args = parser.parse_args()
+	
+	report = run(args.filter)
+	if args.output:
+		with open(args.output, 'w') as output_file:
+			json.dump(report, output_file, indent=1, sort_keys=True, separators=(',', ': '))
+	
+	if args.compare:
+		with open(args.compare) as baseline_file:
+			baseline = json.load(baseline_file)
+		regressions = compare(report, baseline, args.threshold)
+		if regressions:
+			print('%d regression(s) above %.0f%%' % (len(regressions), args.threshold * 100))
+			sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
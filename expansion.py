@@ -0,0 +1,36 @@
+import collections
+import multiprocessing
+
+try:
+	from concurrent import futures
+except ImportError:
+	futures = None
+
+
+def _require_futures():
+	if futures is None:
+		raise ImportError('concurrent.futures is required for the expansion engine')
+
+
+def expand(rules, start, end, workers=None, chunk_size=1000):
+	_require_futures()
+	if chunk_size < 1:
+		raise ValueError('Invalid chunk size: ' + repr(chunk_size))
+	if workers is None:
+		workers = multiprocessing.cpu_count()
+	
+	# At most two chunks per worker are in flight, so that a slow consumer
+	# does not make results pile up in memory
+	pending = collections.deque()
+	with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+		for first_index in range(0, len(rules), chunk_size):
+			if len(pending) >= 2 * workers:
+				yield pending.popleft().result()
+			chunk = rules[first_index:first_index + chunk_size]
+			pending.append(executor.submit(_expand_chunk, first_index, chunk, start, end))
+		while pending:
+			yield pending.popleft().result()
+
+
+def _expand_chunk(first_index, rules, start, end):
+	return [(index, list(rec.generate_after(start, before=end))) for index, rec in enumerate(rules, first_index)]
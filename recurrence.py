@@ -1,7 +1,13 @@
+import array
 import itertools
 import datetime
 import yearmonth
 
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
 
 DAY_OF_MONTH = 'DAY_OF_MONTH'
 
@@ -17,19 +23,184 @@ SUN = SUNDAY    = 6
 FUTURE = +1
 PAST   = -1
 
+# datetime64[D] counts days from 1970-01-01, which was a Thursday
+_EPOCH_WEEKDAY = THURSDAY
+_EPOCH_YEARMONTH_ORDINAL = 1970 * 12
+
+_ONE_DAY = datetime.timedelta(days=1)
+
+# Bypasses the read-only __setattr__ of the recurrence classes
+_set_attribute = object.__setattr__
+
+
+def _require_numpy():
+	if numpy is None:
+		raise ImportError('NumPy is required for the batch operations')
+
+
+def _to_datetime64(date):
+	return numpy.datetime64(date, 'D')
+
+
+def _to_datetime64_array(dates):
+	return numpy.asarray(dates, dtype='datetime64[D]')
+
+
+def _month_bounds(ym_ordinals):
+	months = (ym_ordinals - _EPOCH_YEARMONTH_ORDINAL).astype('datetime64[M]')
+	first_days = months.astype('datetime64[D]')
+	days_in_month = ((months + 1).astype('datetime64[D]') - first_days).astype(numpy.int64)
+	return first_days, days_in_month
+
+
+def _weekdays(days):
+	return (days.astype(numpy.int64) + _EPOCH_WEEKDAY) % 7
+
+
+def _weekday_days_of_month_from_start(first_days_of_week, ordinal, day):
+	return 1 + (7 + day - first_days_of_week) % 7 + 7 * (ordinal - 1)
+
+
+def _weekday_days_of_month_from_end(first_days_of_week, days_in_month, ordinal, day):
+	last_days_of_week = (first_days_of_week + days_in_month - 1) % 7
+	return days_in_month - (7 - day + last_days_of_week) % 7 + 7 * (ordinal + 1)
+
+
+_weekday_cycle_tables = {}
+
+
+def _get_weekday_cycle_table(ordinal, day):
+	# Day of month of the occurrence in each month of the 400-year cycle,
+	# or 0 where the month has no such weekday
+	table = _weekday_cycle_tables.get((ordinal, day))
+	if table is None:
+		table = array.array('b')
+		for length, first_day_of_week in zip(*yearmonth.get_cycle_tables()):
+			if ordinal < 0:
+				day_of_month = _weekday_days_of_month_from_end(first_day_of_week, length, ordinal, day)
+			else:
+				day_of_month = _weekday_days_of_month_from_start(first_day_of_week, ordinal, day)
+			table.append(day_of_month if 1 <= day_of_month <= length else 0)
+		_weekday_cycle_tables[(ordinal, day)] = table
+	return table
+
+
+def _extended_gcd(a, b):
+	x0, x1 = 1, 0
+	y0, y1 = 0, 1
+	while b != 0:
+		quotient, remainder = divmod(a, b)
+		a, b = b, remainder
+		x0, x1 = x1, x0 - quotient * x1
+		y0, y1 = y1, y0 - quotient * y1
+	return a, x0, y0
+
 
 class Recurrence(object):
 	
+	__slots__ = ()
+	
 	def generate(self, first_occurrence_number=0, direction=FUTURE):
 		for number in itertools.count(start=first_occurrence_number, step=(-1 if direction < 0 else +1)):
 			occurrence = self.get_occurrence(number)
 			yield occurrence
 	
-	def generate_after(self, date, before=None):
-		occurrence = self.get_occurrence_after(date)
-		while before is None or occurrence < before:
+	def generate_after(self, date, before=None, with_numbers=False):
+		number = self._get_occurrence_number_after(date)
+		while True:
+			occurrence = self.get_occurrence(number)
+			if before is not None and occurrence >= before:
+				break
+			if with_numbers:
+				yield number, occurrence
+			else:
+				yield occurrence
+			number += 1
+	
+	def get_occurrence_before(self, date):
+		return self.get_occurrence(self._get_occurrence_number_before(date))
+	
+	def generate_before(self, date, after=None, with_numbers=False):
+		number = self._get_occurrence_number_before(date)
+		while True:
+			occurrence = self.get_occurrence(number)
+			if after is not None and occurrence <= after:
+				break
+			if with_numbers:
+				yield number, occurrence
+			else:
+				yield occurrence
+			number -= 1
+	
+	def get_occurrence_ordinal(self, number):
+		return self.get_occurrence(number).toordinal()
+	
+	def is_occurrence_ordinal(self, day_ordinal):
+		return self.is_occurrence(datetime.date.fromordinal(day_ordinal))
+	
+	def get_occurrence_number_ordinal(self, day_ordinal):
+		return self.get_occurrence_number(datetime.date.fromordinal(day_ordinal))
+	
+	def get_occurrence_ordinal_after(self, day_ordinal):
+		return self.get_occurrence_ordinal(self._get_occurrence_number_after_ordinal(day_ordinal))
+	
+	def generate_ordinals(self, first_occurrence_number=0, direction=FUTURE):
+		for number in itertools.count(start=first_occurrence_number, step=(-1 if direction < 0 else +1)):
+			yield self.get_occurrence_ordinal(number)
+	
+	def generate_ordinals_after(self, day_ordinal, before=None):
+		number = self._get_occurrence_number_after_ordinal(day_ordinal)
+		while True:
+			occurrence = self.get_occurrence_ordinal(number)
+			if before is not None and occurrence >= before:
+				break
 			yield occurrence
-			occurrence = self.get_occurrence_after(occurrence)
+			number += 1
+	
+	def _get_occurrence_number_after_ordinal(self, day_ordinal):
+		return self._get_occurrence_number_after(datetime.date.fromordinal(day_ordinal))
+	
+	def get_window(self, start, end):
+		first_number = self._get_occurrence_number_after(start - _ONE_DAY)
+		stop_number = self._get_occurrence_number_after(end - _ONE_DAY)
+		return OccurrenceWindow(self, first_number, max(first_number, stop_number))
+	
+	def count_occurrences(self, start, end):
+		return len(self.get_window(start, end))
+	
+	def get_cursor(self, date=None, number=0):
+		cursor = OccurrenceCursor(self, number)
+		if date is not None:
+			cursor.seek(date)
+		return cursor
+	
+	def _get_occurrence_number_after(self, date):
+		return self.get_occurrence_number(self.get_occurrence_after(date))
+	
+	def get_occurrences(self, numbers):
+		_require_numpy()
+		numbers = numpy.asarray(numbers, dtype=numpy.int64)
+		occurrences = [self.get_occurrence(number) for number in numbers.ravel()]
+		return numpy.array(occurrences, dtype='datetime64[D]').reshape(numbers.shape)
+	
+	def are_occurrences(self, candidates):
+		_require_numpy()
+		candidates = _to_datetime64_array(candidates)
+		mask = [self.is_occurrence(candidate) for candidate in candidates.astype(object).ravel()]
+		return numpy.array(mask, dtype=bool).reshape(candidates.shape)
+	
+	def get_occurrence_numbers(self, occurrences):
+		_require_numpy()
+		occurrences = _to_datetime64_array(occurrences)
+		numbers = numpy.zeros(occurrences.shape, dtype=numpy.int64)
+		valid = numpy.zeros(occurrences.shape, dtype=bool)
+		for index, occurrence in enumerate(occurrences.astype(object).ravel()):
+			try:
+				numbers.flat[index] = self.get_occurrence_number(occurrence)
+			except (ValueError, TypeError):
+				continue
+			valid.flat[index] = True
+		return numbers, valid
 	
 	def __ne__(self, other):
 		return not (self == other)
@@ -37,23 +208,54 @@ class Recurrence(object):
 
 class DaysBasedRecurrence(Recurrence):
 	
+	__slots__ = ('anchor', 'period', '_anchor_ordinal')
+	
 	def __init__(self, anchor, period):
 		if not isinstance(anchor, datetime.date):
 			raise ValueError('Invalid anchor instance: ' + repr(anchor))
 		
-		self.anchor = anchor
-		self.period = period
+		_set_attribute(self, 'anchor', anchor)
+		_set_attribute(self, 'period', period)
+		_set_attribute(self, '_anchor_ordinal', anchor.toordinal())
 	
 	def get_occurrence(self, number):
 		delta_days = number * self.period
 		delta = datetime.timedelta(days=delta_days)
 		return self.anchor + delta
 	
+	def get_occurrence_ordinal(self, number):
+		return self._anchor_ordinal + number * self.period
+	
+	def is_occurrence_ordinal(self, day_ordinal):
+		return (day_ordinal - self._anchor_ordinal) % self.period == 0
+	
+	def get_occurrence_number_ordinal(self, day_ordinal):
+		number, remainder = divmod(day_ordinal - self._anchor_ordinal, self.period)
+		if remainder == 0:
+			return number
+		else:
+			raise ValueError('The day ordinal %r is not a valid occurrence' % day_ordinal)
+	
+	def _get_occurrence_number_after_ordinal(self, day_ordinal):
+		return (day_ordinal - self._anchor_ordinal) // self.period + 1
+	
+	def get_occurrences(self, numbers):
+		_require_numpy()
+		numbers = numpy.asarray(numbers, dtype=numpy.int64)
+		deltas = (numbers * self.period).astype('timedelta64[D]')
+		return _to_datetime64(self.anchor) + deltas
+	
 	def is_occurrence(self, candidate):
 		delta = candidate - self.anchor
 		delta_days = delta.days
 		return delta_days % self.period == 0
 	
+	def are_occurrences(self, candidates):
+		_require_numpy()
+		candidates = _to_datetime64_array(candidates)
+		deltas_days = (candidates - _to_datetime64(self.anchor)).astype(numpy.int64)
+		return (deltas_days % self.period == 0) & ~numpy.isnat(candidates)
+	
 	def get_occurrence_number(self, occurrence):
 		delta = occurrence - self.anchor
 		delta_days = delta.days
@@ -62,6 +264,15 @@ class DaysBasedRecurrence(Recurrence):
 		else:
 			raise ValueError('The date %r is not a valid occurrence' % occurrence)
 	
+	def get_occurrence_numbers(self, occurrences):
+		_require_numpy()
+		occurrences = _to_datetime64_array(occurrences)
+		deltas_days = (occurrences - _to_datetime64(self.anchor)).astype(numpy.int64)
+		numbers, remainders = numpy.divmod(deltas_days, self.period)
+		valid = (remainders == 0) & ~numpy.isnat(occurrences)
+		numbers[~valid] = 0
+		return numbers, valid
+	
 	def get_occurrence_after(self, date):
 		delta = date - self.anchor
 		delta_days = delta.days
@@ -70,11 +281,39 @@ class DaysBasedRecurrence(Recurrence):
 		delta = datetime.timedelta(days=delta_days)
 		occurrence = self.anchor + delta
 		return occurrence
+	
+	def _get_occurrence_number_after(self, date):
+		delta = date - self.anchor
+		return delta.days // self.period + 1
+	
+	def _get_occurrence_number_before(self, date):
+		delta = date - self.anchor
+		return -(-delta.days // self.period) - 1
+	
+	def intersect(self, other):
+		if not isinstance(other, DaysBasedRecurrence):
+			raise ValueError('Invalid recurrence instance: ' + repr(other))
+		
+		# Chinese remainder theorem: find x = a1 (mod p1) and x = a2 (mod p2)
+		gcd, inverse, _ = _extended_gcd(self.period, other.period)
+		delta_days = (other.anchor - self.anchor).days
+		if delta_days % gcd != 0:
+			return None
+		other_period = other.period // gcd
+		steps = (delta_days // gcd) * inverse % other_period
+		period = self.period * other_period
+		
+		# Anchor at the first common occurrence not before both anchors
+		remaining_days = max(0, delta_days) - steps * self.period
+		offset_days = steps * self.period - (-remaining_days // period) * period
+		anchor = self.anchor + datetime.timedelta(days=offset_days)
+		return DaysBasedRecurrence(anchor, period)
 		
 	def __setattr__(self, attr, value):
-		if attr in ('anchor', 'period') and hasattr(self, attr):
-			raise AttributeError('Attribute ' + attr + ' cannot be set')
-		return super(DaysBasedRecurrence, self).__setattr__(attr, value)
+		raise AttributeError('Attribute ' + attr + ' cannot be set')
+	
+	def __delattr__(self, attr):
+		raise AttributeError('Attribute ' + attr + ' cannot be deleted')
 	
 	def __eq__(self, other):
 		return (isinstance(other, DaysBasedRecurrence)
@@ -84,10 +323,23 @@ class DaysBasedRecurrence(Recurrence):
 	
 	def __hash__(self):
 		return hash(self.anchor) ^ hash(self.period) 
+	
+	def __reduce__(self):
+		if type(self.anchor) is datetime.date:
+			return (_days_based_from_ordinal, (self.__class__, self._anchor_ordinal, self.period))
+		return (_days_based_from_anchor, (self.__class__, self.anchor, self.period))
+	
+	def __copy__(self):
+		return self
+	
+	def __deepcopy__(self, memo):
+		return self
 
 
 class MonthsBasedRecurrence(Recurrence):
 	
+	__slots__ = ('anchor', 'period', 'ordinal', 'day', '_anchor_ordinal', '_cycle_table')
+	
 	def __init__(self, anchor, period, ordinal, day=DAY_OF_MONTH):
 		if not isinstance(anchor, yearmonth.YearMonth):
 			raise ValueError('Invalid anchor instance: ' + repr(anchor))
@@ -95,66 +347,178 @@ class MonthsBasedRecurrence(Recurrence):
 		if day not in (DAY_OF_MONTH, SUN, MON, TUE, WED, THU, FRI, SAT):
 			raise ValueError('Invalid day: ' + repr(day))
 		
-		self.anchor = anchor
-		self.period = period
-		self.ordinal = ordinal
-		self.day = day
+		_set_attribute(self, 'anchor', anchor)
+		_set_attribute(self, 'period', period)
+		_set_attribute(self, 'ordinal', ordinal)
+		_set_attribute(self, 'day', day)
+		_set_attribute(self, '_anchor_ordinal', anchor.to_ordinal())
+		_set_attribute(self, '_cycle_table', None)
 	
 	def get_occurrence(self, number):
-		ym = self.anchor + number * self.period
-		return self._date_for_yearmonth(ym)
+		return self._date_for_ordinal(self._anchor_ordinal + number * self.period)
+	
+	def get_occurrences(self, numbers):
+		_require_numpy()
+		numbers = numpy.asarray(numbers, dtype=numpy.int64)
+		ym_ordinals = self._anchor_ordinal + numbers * self.period
+		return self._dates_for_yearmonth_ordinals(ym_ordinals)
 	
 	def is_occurrence(self, candidate_occurrence):
-		ym = yearmonth.YearMonth.from_date(candidate_occurrence)
-		delta = ym - self.anchor
+		ym_ordinal = candidate_occurrence.year * 12 + candidate_occurrence.month - 1
+		delta = ym_ordinal - self._anchor_ordinal
 		if delta % self.period != 0:
 			return False
 		else:
-			return self._date_for_yearmonth(ym) == candidate_occurrence
+			return self._date_for_ordinal(ym_ordinal) == candidate_occurrence
+	
+	def are_occurrences(self, candidates):
+		numbers, valid = self.get_occurrence_numbers(candidates)
+		return valid
 	
 	def get_occurrence_number(self, occurrence):
-		ym = yearmonth.YearMonth.from_date(occurrence)
-		delta = ym - self.anchor
-		if delta % self.period == 0 and self._date_for_yearmonth(ym) == occurrence:
+		ym_ordinal = occurrence.year * 12 + occurrence.month - 1
+		delta = ym_ordinal - self._anchor_ordinal
+		if delta % self.period == 0 and self._date_for_ordinal(ym_ordinal) == occurrence:
 			return delta // self.period
 		else:
 			raise ValueError('The date %r is not a valid occurrence' % occurrence)
 	
+	def get_occurrence_numbers(self, occurrences):
+		_require_numpy()
+		occurrences = _to_datetime64_array(occurrences)
+		ym_ordinals = occurrences.astype('datetime64[M]').astype(numpy.int64) + _EPOCH_YEARMONTH_ORDINAL
+		deltas = ym_ordinals - self._anchor_ordinal
+		numbers, remainders = numpy.divmod(deltas, self.period)
+		first_days, days_in_month, days_of_month = self._days_of_month_for_yearmonth_ordinals(ym_ordinals)
+		expected = first_days + (days_of_month - 1).astype('timedelta64[D]')
+		valid = ((remainders == 0)
+			& self._valid_days_of_month(days_in_month, days_of_month)
+			& (expected == occurrences)
+		)
+		numbers[~valid] = 0
+		return numbers, valid
+	
 	def get_occurrence_after(self, date):
-		ym = yearmonth.YearMonth.from_date(date)
-		delta = ym - self.anchor
-		remainder = delta % self.period
+		return self.get_occurrence(self._get_occurrence_number_after(date))
+	
+	def _get_occurrence_number_after(self, date):
+		ym_ordinal = date.year * 12 + date.month - 1
+		delta = ym_ordinal - self._anchor_ordinal
+		number, remainder = divmod(delta, self.period)
 		if remainder != 0:
-			ym += self.period - remainder
-		occurrence = self._date_for_yearmonth(ym)
-		if remainder == 0 and occurrence <= date:
-			ym += self.period
-			occurrence = self._date_for_yearmonth(ym)
-		return occurrence
+			number += 1
+		elif self._date_for_ordinal(ym_ordinal) <= date:
+			number += 1
+		return number
+	
+	def _get_occurrence_number_before(self, date):
+		ym_ordinal = date.year * 12 + date.month - 1
+		delta = ym_ordinal - self._anchor_ordinal
+		number, remainder = divmod(delta, self.period)
+		if remainder == 0 and self._date_for_ordinal(ym_ordinal) >= date:
+			number -= 1
+		return number
+	
+	def get_occurrence_ordinal(self, number):
+		return self._day_ordinal_for_ordinal(self._anchor_ordinal + number * self.period)
+	
+	def is_occurrence_ordinal(self, day_ordinal):
+		ym_ordinal, day_of_month = yearmonth.split_day_ordinal(day_ordinal)
+		delta = ym_ordinal - self._anchor_ordinal
+		if delta % self.period != 0:
+			return False
+		else:
+			return self._day_ordinal_for_ordinal(ym_ordinal) == day_ordinal
+	
+	def get_occurrence_number_ordinal(self, day_ordinal):
+		ym_ordinal, day_of_month = yearmonth.split_day_ordinal(day_ordinal)
+		delta = ym_ordinal - self._anchor_ordinal
+		if delta % self.period == 0 and self._day_ordinal_for_ordinal(ym_ordinal) == day_ordinal:
+			return delta // self.period
+		else:
+			raise ValueError('The day ordinal %r is not a valid occurrence' % day_ordinal)
+	
+	def _get_occurrence_number_after_ordinal(self, day_ordinal):
+		ym_ordinal, day_of_month = yearmonth.split_day_ordinal(day_ordinal)
+		delta = ym_ordinal - self._anchor_ordinal
+		number, remainder = divmod(delta, self.period)
+		if remainder != 0:
+			number += 1
+		elif self._day_ordinal_for_ordinal(ym_ordinal) <= day_ordinal:
+			number += 1
+		return number
 	
 	def _date_for_yearmonth(self, ym):
+		return self._date_for_ordinal(ym.to_ordinal())
+	
+	def _date_for_ordinal(self, ym_ordinal):
+		year, month = divmod(ym_ordinal, 12)
+		day_of_month = self._day_of_month_for_ordinal(ym_ordinal)
+		if day_of_month < 1:
+			return datetime.date(year, month + 1, 1) + datetime.timedelta(days=day_of_month-1)
+		return datetime.date(year, month + 1, day_of_month)
+	
+	def _day_ordinal_for_ordinal(self, ym_ordinal):
+		return yearmonth.first_day_ordinal(ym_ordinal) + self._day_of_month_for_ordinal(ym_ordinal) - 1
+	
+	def _day_of_month_for_ordinal(self, ym_ordinal):
+		position = ym_ordinal % yearmonth.CYCLE_MONTHS
 		if self.day == DAY_OF_MONTH:
+			lengths, weekdays = yearmonth.get_cycle_tables()
 			if self.ordinal < 0:
-				return ym.get_last_day() + datetime.timedelta(days=self.ordinal+1)
-			else:
-				return ym.get_date(self.ordinal)
+				return lengths[position] + self.ordinal + 1
+			elif 1 <= self.ordinal <= lengths[position]:
+				return self.ordinal
 		else:
+			day_of_month = self._get_cycle_table()[position]
+			if day_of_month != 0:
+				return day_of_month
+		raise ValueError('No occurrence in %s' % yearmonth.YearMonth.from_ordinal(ym_ordinal))
+	
+	def _get_cycle_table(self):
+		table = self._cycle_table
+		if table is None:
+			table = _get_weekday_cycle_table(self.ordinal, self.day)
+			_set_attribute(self, '_cycle_table', table)
+		return table
+	
+	def _days_of_month_for_yearmonth_ordinals(self, ym_ordinals):
+		first_days, days_in_month = _month_bounds(ym_ordinals)
+		
+		if self.day == DAY_OF_MONTH:
 			if self.ordinal < 0:
-				last_date_of_month = ym.get_last_day()
-				last_day_of_week = last_date_of_month.weekday()
-				last_day_of_month = last_date_of_month.day
-				day_of_month = last_day_of_month  - (7 - self.day + last_day_of_week ) % 7 + 7 * (self.ordinal + 1)
-				return ym.get_date(day_of_month)
+				days_of_month = days_in_month + (self.ordinal + 1)
 			else:
-				first_day_of_week = ym.get_first_day().weekday()
-				first_day_of_month = 1
-				day_of_month = first_day_of_month + (7 + self.day - first_day_of_week) % 7 + 7 * (self.ordinal - 1)
-				return ym.get_date(day_of_month)
+				days_of_month = numpy.full(ym_ordinals.shape, self.ordinal, dtype=numpy.int64)
+		else:
+			table = numpy.frombuffer(self._get_cycle_table(), dtype=numpy.int8)
+			days_of_month = table[ym_ordinals % yearmonth.CYCLE_MONTHS].astype(numpy.int64)
+		
+		return first_days, days_in_month, days_of_month
+	
+	def _valid_days_of_month(self, days_in_month, days_of_month):
+		# Negative day-of-month ordinals are applied as a timedelta, so they may
+		# fall outside the month, just like in _date_for_yearmonth()
+		if self.day == DAY_OF_MONTH and self.ordinal < 0:
+			return numpy.ones(days_of_month.shape, dtype=bool)
+		else:
+			return (days_of_month >= 1) & (days_of_month <= days_in_month)
+	
+	def _dates_for_yearmonth_ordinals(self, ym_ordinals):
+		first_days, days_in_month, days_of_month = self._days_of_month_for_yearmonth_ordinals(ym_ordinals)
+		
+		invalid = ~self._valid_days_of_month(days_in_month, days_of_month)
+		if invalid.any():
+			ym = yearmonth.YearMonth.from_ordinal(int(ym_ordinals[invalid].flat[0]))
+			raise ValueError('No occurrence in %s' % ym)
+		
+		return first_days + (days_of_month - 1).astype('timedelta64[D]')
 	
 	def __setattr__(self, attr, value):
-		if attr in ('anchor', 'period', 'ordinal', 'day') and hasattr(self, attr):
-			raise AttributeError('Attribute ' + attr + ' cannot be set')
-		return super(MonthsBasedRecurrence, self).__setattr__(attr, value)
+		raise AttributeError('Attribute ' + attr + ' cannot be set')
+	
+	def __delattr__(self, attr):
+		raise AttributeError('Attribute ' + attr + ' cannot be deleted')
 	
 	def __eq__(self, other):
 		return (isinstance(other, MonthsBasedRecurrence)
@@ -165,4 +529,163 @@ class MonthsBasedRecurrence(Recurrence):
 		)
 	
 	def __hash__(self):
-		return hash(self.anchor) ^ hash(self.period) ^ hash(self.ordinal) ^ hash(self.day)  
+		return hash(self.anchor) ^ hash(self.period) ^ hash(self.ordinal) ^ hash(self.day)
+	
+	def __reduce__(self):
+		return (_months_based_from_anchor, (self.__class__, self.anchor, self.period, self.ordinal, self.day))
+	
+	def __copy__(self):
+		return self
+	
+	def __deepcopy__(self, memo):
+		return self
+
+
+# Pickle reconstructors, which skip the validation already done when the
+# pickled instance was created. Days-based anchors that are plain dates are
+# stored as ordinals, which are cheaper to pickle; other anchors, such as
+# datetimes, are kept so that their type survives. YearMonth anchors are kept
+# since interned instances are pickled only once.
+def _days_based_from_ordinal(cls, anchor_ordinal, period):
+	self = object.__new__(cls)
+	_set_attribute(self, 'anchor', datetime.date.fromordinal(anchor_ordinal))
+	_set_attribute(self, 'period', period)
+	_set_attribute(self, '_anchor_ordinal', anchor_ordinal)
+	return self
+
+
+def _days_based_from_anchor(cls, anchor, period):
+	self = object.__new__(cls)
+	_set_attribute(self, 'anchor', anchor)
+	_set_attribute(self, 'period', period)
+	_set_attribute(self, '_anchor_ordinal', anchor.toordinal())
+	return self
+
+
+def _months_based_from_anchor(cls, anchor, period, ordinal, day):
+	self = object.__new__(cls)
+	_set_attribute(self, 'anchor', anchor)
+	_set_attribute(self, 'period', period)
+	_set_attribute(self, 'ordinal', ordinal)
+	_set_attribute(self, 'day', day)
+	_set_attribute(self, '_anchor_ordinal', anchor.to_ordinal())
+	_set_attribute(self, '_cycle_table', None)
+	return self
+
+
+class OccurrenceWindow(object):
+	
+	def __init__(self, recurrence, start_number, stop_number, step=1):
+		self.recurrence = recurrence
+		self.start_number = start_number
+		self.stop_number = stop_number
+		self.step = step
+	
+	def get_number(self, index):
+		length = len(self)
+		if index < 0:
+			index += length
+		if index < 0 or index >= length:
+			raise IndexError('Occurrence window index out of range')
+		return self.start_number + index * self.step
+	
+	def first(self):
+		if len(self) == 0:
+			return None
+		return self[0]
+	
+	def last(self):
+		if len(self) == 0:
+			return None
+		return self[-1]
+	
+	def __len__(self):
+		if self.step > 0:
+			span = self.stop_number - self.start_number
+		else:
+			span = self.start_number - self.stop_number
+		return max(0, (span + abs(self.step) - 1) // abs(self.step))
+	
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			start, stop, step = index.indices(len(self))
+			return OccurrenceWindow(self.recurrence,
+					self.start_number + start * self.step,
+					self.start_number + stop * self.step,
+					step * self.step,
+				)
+		else:
+			return self.recurrence.get_occurrence(self.get_number(index))
+	
+	def __iter__(self):
+		number = self.start_number
+		for _ in itertools.repeat(None, len(self)):
+			yield self.recurrence.get_occurrence(number)
+			number += self.step
+	
+	def __reversed__(self):
+		number = self.start_number + (len(self) - 1) * self.step
+		for _ in itertools.repeat(None, len(self)):
+			yield self.recurrence.get_occurrence(number)
+			number -= self.step
+	
+	def __contains__(self, date):
+		try:
+			number = self.recurrence.get_occurrence_number(date)
+		except ValueError:
+			return False
+		offset, remainder = divmod(number - self.start_number, self.step)
+		return remainder == 0 and 0 <= offset < len(self)
+	
+	def __repr__(self):
+		return '%s(%r, %d, %d, %d)' % (self.__class__.__name__,
+				self.recurrence, self.start_number, self.stop_number, self.step
+			)
+
+
+class OccurrenceCursor(object):
+	
+	def __init__(self, recurrence, number=0):
+		self.recurrence = recurrence
+		self.number = number
+	
+	@property
+	def occurrence(self):
+		return self.recurrence.get_occurrence(self.number)
+	
+	def next(self):
+		return self.advance(1)
+	
+	__next__ = next
+	
+	def prev(self):
+		return self.advance(-1)
+	
+	def advance(self, count):
+		occurrence = self.recurrence.get_occurrence(self.number + count)
+		self.number += count
+		return occurrence
+	
+	def seek(self, date):
+		self.number = self.recurrence._get_occurrence_number_after(date - _ONE_DAY)
+		return self.occurrence
+	
+	def __iter__(self):
+		return self
+	
+	def __eq__(self, other):
+		return (isinstance(other, OccurrenceCursor)
+			and self.recurrence == other.recurrence
+			and self.number == other.number
+		)
+	
+	def __ne__(self, other):
+		return not (self == other)
+	
+	__hash__ = None
+	
+	def __reduce__(self):
+		return (self.__class__, (self.recurrence, self.number))
+	
+	def __repr__(self):
+		return '%s(%r, %d)' % (self.__class__.__name__, self.recurrence, self.number)
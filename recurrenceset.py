@@ -0,0 +1,342 @@
+import bisect
+import datetime
+import heapq
+import itertools
+import weakref
+import recurrence
+
+
+_ONE_DAY = datetime.timedelta(days=1)
+
+# Days in a 400-year Gregorian cycle, after which months-based rules repeat
+_CYCLE_DAYS = 146097
+_CYCLE_MONTHS = 4800
+
+
+class RecurrenceSet(object):
+	
+	def __init__(self, recurrences=()):
+		self._entries = {}
+		self._iterators = weakref.WeakSet()
+		self._serials = itertools.count()
+		for recurrence in recurrences:
+			self.add(recurrence)
+	
+	def add(self, recurrence, tag=None):
+		if tag is None:
+			# An untagged rule is its own tag, so adding an equal rule again
+			# leaves the set as it is
+			tag = recurrence
+			entry = self._entries.get(tag)
+			if entry is not None and entry.recurrence == recurrence:
+				return
+		if tag in self._entries:
+			raise ValueError('Tag already in set: ' + repr(tag))
+		entry = _Entry(recurrence, tag, next(self._serials))
+		self._entries[tag] = entry
+		for iterator in list(self._iterators):
+			iterator._add_entry(entry)
+	
+	def remove(self, tag):
+		entry = self._entries.pop(tag)
+		entry.removed = True
+	
+	def get_recurrence(self, tag):
+		return self._entries[tag].recurrence
+	
+	def is_occurrence(self, candidate):
+		return any(entry.recurrence.is_occurrence(candidate) for entry in self._entries.values())
+	
+	def get_occurrence_after(self, date):
+		occurrences = [entry.recurrence.get_occurrence_after(date) for entry in self._entries.values()]
+		return min(occurrences) if occurrences else None
+	
+	def get_occurrence_before(self, date):
+		occurrences = [entry.recurrence.get_occurrence_before(date) for entry in self._entries.values()]
+		return max(occurrences) if occurrences else None
+	
+	def generate_after(self, date, before=None):
+		iterator = _RecurrenceSetIterator(self, date, before)
+		self._iterators.add(iterator)
+		return iterator
+	
+	def __len__(self):
+		return len(self._entries)
+	
+	def __contains__(self, tag):
+		return tag in self._entries
+	
+	def __iter__(self):
+		return iter(list(self._entries))
+
+
+class _Entry(object):
+	
+	def __init__(self, recurrence, tag, serial):
+		self.recurrence = recurrence
+		self.tag = tag
+		self.serial = serial
+		self.removed = False
+
+
+class _RecurrenceSetIterator(object):
+	
+	def __init__(self, recurrence_set, date, before):
+		self._recurrence_set = recurrence_set
+		self._last_date = date
+		self._before = before
+		# Heap items are [occurrence, serial, number, entry] lists which are
+		# updated in place when their rule steps to the next occurrence
+		self._heap = []
+		for entry in recurrence_set._entries.values():
+			self._heap.append(self._make_item(entry))
+		heapq.heapify(self._heap)
+	
+	def _make_item(self, entry):
+		number = entry.recurrence._get_occurrence_number_after(self._last_date)
+		return [entry.recurrence.get_occurrence(number), entry.serial, number, entry]
+	
+	def _add_entry(self, entry):
+		heapq.heappush(self._heap, self._make_item(entry))
+	
+	def __iter__(self):
+		return self
+	
+	def next(self):
+		heap = self._heap
+		while heap and heap[0][3].removed:
+			heapq.heappop(heap)
+		if not heap:
+			self._stop()
+		
+		date = heap[0][0]
+		if self._before is not None and date >= self._before:
+			self._stop()
+		
+		tags = []
+		while heap and heap[0][0] == date:
+			item = heap[0]
+			entry = item[3]
+			if entry.removed:
+				heapq.heappop(heap)
+				continue
+			tags.append(entry.tag)
+			item[2] += 1
+			item[0] = entry.recurrence.get_occurrence(item[2])
+			heapq.heapreplace(heap, item)
+		
+		self._last_date = date
+		return date, tags
+	
+	__next__ = next
+	
+	def _stop(self):
+		# Once exhausted, the iterator stays so even if rules are added later
+		self._heap = []
+		self._recurrence_set._iterators.discard(self)
+		raise StopIteration
+
+
+class _Combination(object):
+	
+	def generate_after(self, date, before=None):
+		occurrence = self.get_occurrence_after(date)
+		while occurrence is not None and (before is None or occurrence < before):
+			yield occurrence
+			occurrence = self.get_occurrence_after(occurrence)
+	
+	def generate_before(self, date, after=None):
+		occurrence = self.get_occurrence_before(date)
+		while occurrence is not None and (after is None or occurrence > after):
+			yield occurrence
+			occurrence = self.get_occurrence_before(occurrence)
+	
+	def get_occurrences_between(self, start, end):
+		return list(self.generate_before(end, after=start - _ONE_DAY))[::-1]
+	
+	def count_occurrences(self, start, end):
+		return sum(1 for _ in self.generate_before(end, after=start - _ONE_DAY))
+
+
+class DateList(_Combination):
+	
+	def __init__(self, dates):
+		self.dates = tuple(sorted(set(dates)))
+		self._dates_set = frozenset(self.dates)
+	
+	def is_occurrence(self, candidate):
+		return candidate in self._dates_set
+	
+	def get_occurrence_after(self, date):
+		index = bisect.bisect_right(self.dates, date)
+		if index < len(self.dates):
+			return self.dates[index]
+		else:
+			return None
+	
+	def get_occurrence_before(self, date):
+		index = bisect.bisect_left(self.dates, date)
+		if index > 0:
+			return self.dates[index - 1]
+		else:
+			return None
+
+
+class Union(_Combination):
+	
+	def __init__(self, *operands):
+		self.operands = operands
+	
+	def is_occurrence(self, candidate):
+		return any(operand.is_occurrence(candidate) for operand in self.operands)
+	
+	def get_occurrence_after(self, date):
+		occurrences = _existing(operand.get_occurrence_after(date) for operand in self.operands)
+		return min(occurrences) if occurrences else None
+	
+	def get_occurrence_before(self, date):
+		occurrences = _existing(operand.get_occurrence_before(date) for operand in self.operands)
+		return max(occurrences) if occurrences else None
+
+
+class Intersection(_Combination):
+	
+	def __init__(self, *operands):
+		# With no operands there would be no rule to bound the occurrences
+		if not operands:
+			raise ValueError('Intersection requires at least one operand')
+		self.operands = operands
+		self._operands = operands
+		# Days-based operands are merged into a single rule up front, which
+		# leaves no operand when they have no common occurrence
+		if all(isinstance(operand, recurrence.DaysBasedRecurrence) for operand in operands):
+			merged = operands[0]
+			for operand in operands[1:]:
+				merged = merged.intersect(operand)
+				if merged is None:
+					break
+			self._operands = (merged,) if merged is not None else ()
+	
+	def is_occurrence(self, candidate):
+		return bool(self._operands) and all(operand.is_occurrence(candidate) for operand in self._operands)
+	
+	def get_occurrence_after(self, date):
+		if not self._operands:
+			return None
+		return self._leapfrog(self._operands[0].get_occurrence_after(date), 'get_occurrence_after', _search_limit(self, date, +1))
+	
+	def get_occurrence_before(self, date):
+		if not self._operands:
+			return None
+		return self._leapfrog(self._operands[0].get_occurrence_before(date), 'get_occurrence_before', _search_limit(self, date, -1))
+	
+	def _leapfrog(self, candidate, step, limit):
+		# Each operand that rejects the candidate moves it to its own next
+		# occurrence, until all of them agree on it or it passes the limit
+		while candidate is not None and not _is_beyond(candidate, limit, step):
+			for operand in self._operands:
+				if not operand.is_occurrence(candidate):
+					candidate = getattr(operand, step)(candidate)
+					break
+			else:
+				return candidate
+		return None
+
+
+class Difference(_Combination):
+	
+	def __init__(self, base, *excluded):
+		self.base = base
+		self.excluded = excluded
+	
+	def is_occurrence(self, candidate):
+		return (self.base.is_occurrence(candidate)
+			and not any(operand.is_occurrence(candidate) for operand in self.excluded)
+		)
+	
+	def get_occurrence_after(self, date):
+		return self._skip_excluded(date, 'get_occurrence_after', _search_limit(self, date, +1))
+	
+	def get_occurrence_before(self, date):
+		return self._skip_excluded(date, 'get_occurrence_before', _search_limit(self, date, -1))
+	
+	def _skip_excluded(self, date, step, limit):
+		occurrence = getattr(self.base, step)(date)
+		while occurrence is not None and self._is_excluded(occurrence):
+			if _is_beyond(occurrence, limit, step):
+				return None
+			occurrence = getattr(self.base, step)(occurrence)
+		return occurrence
+	
+	def _is_excluded(self, occurrence):
+		return any(operand.is_occurrence(occurrence) for operand in self.excluded)
+
+
+def _existing(occurrences):
+	return [occurrence for occurrence in occurrences if occurrence is not None]
+
+
+def _periodicity(operand):
+	# Returns (cycle, last, first): past the last and before the first of the
+	# finite dates involved, the occurrences repeat every cycle days. The cycle
+	# is None when it is unknown and the dates are None when there are none.
+	if isinstance(operand, recurrence.DaysBasedRecurrence):
+		return abs(operand.period), None, None
+	elif isinstance(operand, recurrence.MonthsBasedRecurrence):
+		period = abs(operand.period)
+		return _CYCLE_DAYS * (period // _gcd(period, _CYCLE_MONTHS)), None, None
+	elif isinstance(operand, DateList):
+		if not operand.dates:
+			return 1, None, None
+		return 1, operand.dates[-1], operand.dates[0]
+	elif isinstance(operand, Difference):
+		return _combined_periodicity((operand.base,) + operand.excluded)
+	elif isinstance(operand, (Union, Intersection)):
+		return _combined_periodicity(operand.operands)
+	elif isinstance(operand, RecurrenceSet):
+		return _combined_periodicity([entry.recurrence for entry in operand._entries.values()])
+	else:
+		return None, None, None
+
+
+def _combined_periodicity(operands):
+	cycle, last, first = 1, None, None
+	for operand in operands:
+		operand_cycle, operand_last, operand_first = _periodicity(operand)
+		if operand_cycle is None or cycle is None:
+			cycle = None
+		else:
+			cycle = cycle * operand_cycle // _gcd(cycle, operand_cycle)
+		if operand_last is not None and (last is None or operand_last > last):
+			last = operand_last
+		if operand_first is not None and (first is None or operand_first < first):
+			first = operand_first
+	return cycle, last, first
+
+
+def _search_limit(combination, date, direction):
+	# A search that goes a whole cycle past the finite dates without a match
+	# will never find one
+	cycle, last, first = _periodicity(combination)
+	if cycle is None:
+		return None
+	try:
+		if direction > 0:
+			return max(date, last or date) + datetime.timedelta(days=cycle)
+		else:
+			return min(date, first or date) - datetime.timedelta(days=cycle)
+	except OverflowError:
+		return datetime.date.max if direction > 0 else datetime.date.min
+
+
+def _is_beyond(date, limit, step):
+	if limit is None:
+		return False
+	if step == 'get_occurrence_after':
+		return date > limit
+	else:
+		return date < limit
+
+
+def _gcd(a, b):
+	return recurrence._extended_gcd(a, b)[0]
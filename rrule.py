@@ -0,0 +1,213 @@
+import datetime
+import recurrence
+import yearmonth
+
+
+_WEEKDAY_CODES = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+_WEEKDAYS = dict((code, day) for day, code in enumerate(_WEEKDAY_CODES))
+
+_SUPPORTED_PARTS = frozenset(['FREQ', 'INTERVAL', 'BYDAY', 'BYMONTHDAY', 'BYMONTH', 'WKST'])
+_FREQUENCIES = frozenset(['DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY'])
+
+# Parsed rules are cached by string; the cache is dropped when it grows
+# past this size
+_CACHE_SIZE = 4096
+_cache = {}
+
+
+def parse(rrule, dtstart):
+	return _build(_parse_cached(rrule), rrule, dtstart)
+
+
+def parse_many(items):
+	recurrences = []
+	errors = []
+	for index, (rrule, dtstart) in enumerate(items):
+		try:
+			recurrences.append(_build(_parse_cached(rrule), rrule, dtstart))
+		except ValueError as e:
+			recurrences.append(None)
+			errors.append((index, rrule, str(e)))
+	return recurrences, errors
+
+
+def format(rec):
+	if isinstance(rec, (recurrence.DaysBasedRecurrence, recurrence.MonthsBasedRecurrence)):
+		_check_interval(rec.period)
+	if isinstance(rec, recurrence.DaysBasedRecurrence):
+		if rec.period % 7 == 0:
+			return _format_parts('WEEKLY', rec.period // 7)
+		else:
+			return _format_parts('DAILY', rec.period)
+	elif isinstance(rec, recurrence.MonthsBasedRecurrence):
+		if rec.day == recurrence.DAY_OF_MONTH:
+			by = 'BYMONTHDAY=%d' % _check_month_day_in_months(rec.anchor, rec.period, _check_by_month_day(rec.ordinal))
+		else:
+			by = 'BYDAY=%d%s' % (_check_by_day_ordinal(rec.ordinal), _WEEKDAY_CODES[rec.day])
+		return _format_parts('MONTHLY', rec.period, by)
+	else:
+		raise ValueError('Invalid recurrence instance: ' + repr(rec))
+
+
+def get_dtstart(rec):
+	if isinstance(rec, recurrence.DaysBasedRecurrence):
+		return rec.anchor
+	elif isinstance(rec, recurrence.MonthsBasedRecurrence):
+		return rec.anchor.get_first_day()
+	else:
+		raise ValueError('Invalid recurrence instance: ' + repr(rec))
+
+
+def _format_parts(frequency, interval, *parts):
+	parts = ('FREQ=' + frequency,) + (('INTERVAL=%d' % interval,) if interval != 1 else ()) + parts
+	return ';'.join(parts)
+
+
+def _parse_cached(rrule):
+	try:
+		return _cache[rrule]
+	except KeyError:
+		pass
+	# Failures are cached as their message, so that each lookup raises a
+	# fresh exception
+	try:
+		parsed = (_parse(rrule), None)
+	except ValueError as e:
+		parsed = (None, e.args[0])
+	if len(_cache) >= _CACHE_SIZE:
+		_cache.clear()
+	_cache[rrule] = parsed
+	return parsed
+
+
+def _parse(rrule):
+	body = rrule.strip()
+	if body[:6].upper() == 'RRULE:':
+		body = body[6:]
+	
+	parts = {}
+	for part in body.split(';'):
+		name, sep, value = part.partition('=')
+		name = name.strip().upper()
+		if not sep or not name:
+			raise ValueError('Malformed rule part: ' + repr(part))
+		if name not in _SUPPORTED_PARTS:
+			raise ValueError('Unsupported rule part: ' + name)
+		if name in parts:
+			raise ValueError('Repeated rule part: ' + name)
+		parts[name] = value.strip().upper()
+	
+	frequency = parts.get('FREQ')
+	if frequency not in _FREQUENCIES:
+		raise ValueError('Unsupported frequency: ' + repr(frequency))
+	interval = _check_interval(_parse_int(parts.get('INTERVAL', '1'), 'INTERVAL'))
+	
+	by_day = None
+	if 'BYDAY' in parts:
+		by_day = _parse_by_day(parts['BYDAY'])
+	by_month_day = None
+	if 'BYMONTHDAY' in parts:
+		by_month_day = _check_by_month_day(_parse_int(parts['BYMONTHDAY'], 'BYMONTHDAY'))
+	by_month = None
+	if 'BYMONTH' in parts:
+		by_month = _parse_int(parts['BYMONTH'], 'BYMONTH')
+		if not 1 <= by_month <= 12:
+			raise ValueError('Invalid BYMONTH: %d' % by_month)
+	
+	if frequency in ('DAILY', 'WEEKLY'):
+		if by_month_day is not None or by_month is not None:
+			raise ValueError('Unsupported BYMONTHDAY or BYMONTH with ' + frequency + ' frequency')
+		if by_day is not None and (frequency == 'DAILY' or by_day[0] is not None):
+			raise ValueError('Unsupported BYDAY with ' + frequency + ' frequency')
+	else:
+		if by_day is not None and by_month_day is not None:
+			raise ValueError('Unsupported BYDAY together with BYMONTHDAY')
+		if by_day is not None and by_day[0] is None:
+			raise ValueError('Unsupported BYDAY without an ordinal with ' + frequency + ' frequency')
+		if frequency == 'MONTHLY' and by_month is not None:
+			raise ValueError('Unsupported BYMONTH with MONTHLY frequency')
+		# Without BYMONTH, a yearly BYDAY counts weekdays in the whole year and
+		# a yearly BYMONTHDAY expands to every month
+		if frequency == 'YEARLY' and by_month is None and (by_day is not None or by_month_day is not None):
+			raise ValueError('Unsupported BYDAY or BYMONTHDAY without BYMONTH with YEARLY frequency')
+	
+	return frequency, interval, by_day, by_month_day, by_month
+
+
+def _parse_int(value, name):
+	try:
+		return int(value)
+	except ValueError:
+		raise ValueError('Invalid %s: %r' % (name, value))
+
+
+def _parse_by_day(value):
+	if ',' in value:
+		raise ValueError('Unsupported BYDAY with several days: ' + value)
+	code = value[-2:]
+	if code not in _WEEKDAYS:
+		raise ValueError('Invalid BYDAY: ' + repr(value))
+	if len(value) == 2:
+		return None, _WEEKDAYS[code]
+	return _check_by_day_ordinal(_parse_int(value[:-2], 'BYDAY')), _WEEKDAYS[code]
+
+
+def _check_interval(interval):
+	if interval < 1:
+		raise ValueError('Invalid interval: %d' % interval)
+	return interval
+
+
+def _check_by_month_day(day):
+	# Negative days below -28 would fall in the previous month of shorter
+	# months, where the RFC skips them
+	if not (1 <= day <= 31 or -28 <= day <= -1):
+		raise ValueError('Unsupported BYMONTHDAY: %d' % day)
+	return day
+
+
+def _check_month_day_in_months(anchor, period, day):
+	# Unlike the RFC, which skips months without the day, the recurrences have
+	# no occurrence there, so the day must exist in every month reached. A
+	# common year stands for all years, since only February varies.
+	if day > 28:
+		months = set((anchor.month - 1 + step * period) % 12 + 1 for step in range(12))
+		if any(yearmonth.days_in_month(2001, month) < day for month in months):
+			raise ValueError('Unsupported day of month %d, which some of the months lack' % day)
+	return day
+
+
+def _check_by_day_ordinal(ordinal):
+	# Not every month has a fifth weekday, where the RFC skips the month
+	if not (1 <= ordinal <= 4 or -4 <= ordinal <= -1):
+		raise ValueError('Unsupported BYDAY ordinal: %d' % ordinal)
+	return ordinal
+
+
+def _build(parsed, rrule, dtstart):
+	fields, error = parsed
+	if error is not None:
+		raise ValueError(error)
+	frequency, interval, by_day, by_month_day, by_month = fields
+	if isinstance(dtstart, datetime.datetime):
+		dtstart = dtstart.date()
+	
+	if frequency == 'DAILY':
+		return recurrence.DaysBasedRecurrence(dtstart, interval)
+	elif frequency == 'WEEKLY':
+		if by_day is not None and by_day[1] != dtstart.weekday():
+			raise ValueError('BYDAY does not match the weekday of DTSTART in ' + repr(rrule))
+		return recurrence.DaysBasedRecurrence(dtstart, 7 * interval)
+	
+	period = interval
+	if frequency == 'YEARLY':
+		if by_month is not None and by_month != dtstart.month:
+			raise ValueError('BYMONTH does not match the month of DTSTART in ' + repr(rrule))
+		period = 12 * interval
+	anchor = yearmonth.YearMonth.from_date(dtstart)
+	if by_day is not None:
+		return recurrence.MonthsBasedRecurrence(anchor, period, by_day[0], by_day[1])
+	elif by_month_day is not None:
+		return recurrence.MonthsBasedRecurrence(anchor, period, _check_month_day_in_months(anchor, period, by_month_day))
+	else:
+		return recurrence.MonthsBasedRecurrence(anchor, period, _check_month_day_in_months(anchor, period, dtstart.day))
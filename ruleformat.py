@@ -0,0 +1,101 @@
+import struct
+import numpy
+import recurrence
+import ruletable
+
+
+MAGIC = b'RREC'
+VERSION = 1
+
+# Header: magic, format version, record size and number of records
+_HEADER = struct.Struct('<4sHHQ')
+
+# One fixed-width record per rule, laid out like the RuleTable columns
+RECORD_DTYPE = numpy.dtype([
+	('kind',    '<i1'),
+	('day',     '<i1'),
+	('ordinal', '<i2'),
+	('period',  '<i4'),
+	('anchor',  '<i8'),
+])
+_RECORD = struct.Struct('<bbhiq')
+
+HEADER_SIZE = _HEADER.size
+RECORD_SIZE = RECORD_DTYPE.itemsize
+
+
+def encode(rec):
+	if isinstance(rec, recurrence.DaysBasedRecurrence):
+		fields = (ruletable.DAYS_BASED, ruletable.DAY_OF_MONTH, 0, rec.period, rec.anchor.toordinal())
+	elif isinstance(rec, recurrence.MonthsBasedRecurrence):
+		if not ruletable._MIN_ORDINAL <= rec.ordinal <= ruletable._MAX_ORDINAL:
+			raise ValueError('Ordinal out of range: ' + repr(rec.ordinal))
+		day = ruletable.DAY_OF_MONTH if rec.day == recurrence.DAY_OF_MONTH else rec.day
+		fields = (ruletable.MONTHS_BASED, day, rec.ordinal, rec.period, rec.anchor.to_ordinal())
+	else:
+		raise ValueError('Invalid recurrence instance: ' + repr(rec))
+	try:
+		return _RECORD.pack(*fields)
+	except struct.error:
+		raise ValueError('Rule does not fit in a record: ' + repr(rec))
+
+
+def decode(data):
+	kind, day, ordinal, period, anchor = _RECORD.unpack(data)
+	if kind not in (ruletable.DAYS_BASED, ruletable.MONTHS_BASED):
+		raise ValueError('Invalid kind in rule record: %d' % kind)
+	if not ruletable.DAY_OF_MONTH <= day <= recurrence.SUNDAY:
+		raise ValueError('Invalid day in rule record: %d' % day)
+	return ruletable._make_recurrence(kind, anchor, period, ordinal, day)
+
+
+def encode_many(rules):
+	if not isinstance(rules, ruletable.RuleTable):
+		rules = ruletable.RuleTable.from_recurrences(rules)
+	return encode_header(len(rules)) + table_to_records(rules).tobytes()
+
+
+def decode_table(data):
+	return records_to_table(decode_records(data))
+
+
+def decode_many(data):
+	return list(decode_table(data))
+
+
+def encode_header(count):
+	return _HEADER.pack(MAGIC, VERSION, RECORD_SIZE, count)
+
+
+def decode_header(data):
+	if len(data) < HEADER_SIZE:
+		raise ValueError('Truncated rule buffer header')
+	magic, version, record_size, count = _HEADER.unpack_from(data)
+	if magic != MAGIC:
+		raise ValueError('Invalid rule buffer magic: ' + repr(magic))
+	if version != VERSION:
+		raise ValueError('Unsupported rule buffer version: %d' % version)
+	if record_size != RECORD_SIZE:
+		raise ValueError('Unsupported rule buffer record size: %d' % record_size)
+	return count
+
+
+def decode_records(data):
+	count = decode_header(data)
+	if len(data) != HEADER_SIZE + count * RECORD_SIZE:
+		raise ValueError('Rule buffer size does not match its header')
+	return numpy.frombuffer(data, dtype=RECORD_DTYPE, count=count, offset=HEADER_SIZE)
+
+
+def table_to_records(table):
+	records = numpy.empty(len(table), dtype=RECORD_DTYPE)
+	records['kind'] = table.kinds
+	records['day'] = table.days
+	records['ordinal'] = table.ordinals
+	records['period'] = table.periods
+	records['anchor'] = table.anchors
+	return records
+
+
+def records_to_table(records):
+	return ruletable.RuleTable(records['kind'], records['anchor'], records['period'], records['ordinal'], records['day'])
@@ -0,0 +1,111 @@
+import datetime
+import recurrence
+import yearmonth
+
+
+_ONE_DAY = datetime.timedelta(days=1)
+
+
+class RecurrenceIndex(object):
+	
+	def __init__(self, recurrences=()):
+		# period -> anchor residue -> rules
+		self._days_based = {}
+		# (ordinal, day) -> (prototype recurrence, period -> month residue -> rules)
+		self._months_based = {}
+		self._count = 0
+		for rec in recurrences:
+			self.add(rec)
+	
+	def add(self, rec):
+		buckets = self._get_buckets(rec, create=True)
+		rules = buckets.setdefault(self._get_residue(rec), set())
+		if rec not in rules:
+			rules.add(rec)
+			self._count += 1
+	
+	def remove(self, rec):
+		buckets = self._get_buckets(rec, create=False)
+		residue = self._get_residue(rec)
+		if buckets is None or rec not in buckets.get(residue, ()):
+			raise KeyError(rec)
+		
+		rules = buckets[residue]
+		rules.remove(rec)
+		self._count -= 1
+		if not rules:
+			del buckets[residue]
+			if not buckets:
+				self._drop_buckets(rec)
+	
+	def find(self, date):
+		found = set()
+		
+		ordinal = date.toordinal()
+		for period, buckets in self._days_based.items():
+			found.update(buckets.get(ordinal % period, ()))
+		
+		ym = yearmonth.YearMonth.from_date(date)
+		ym_ordinal = ym.to_ordinal()
+		for prototype, by_period in self._months_based.values():
+			try:
+				if prototype._date_for_yearmonth(ym) != date:
+					continue
+			except ValueError:
+				continue
+			for period, buckets in by_period.items():
+				found.update(buckets.get(ym_ordinal % period, ()))
+		
+		return found
+	
+	def find_between(self, start, end):
+		date = start
+		while date < end:
+			found = self.find(date)
+			if found:
+				yield date, found
+			date += _ONE_DAY
+	
+	def __len__(self):
+		return self._count
+	
+	def __contains__(self, rec):
+		try:
+			buckets = self._get_buckets(rec, create=False)
+		except ValueError:
+			return False
+		return buckets is not None and rec in buckets.get(self._get_residue(rec), ())
+	
+	def _get_residue(self, rec):
+		if isinstance(rec, recurrence.DaysBasedRecurrence):
+			return rec.anchor.toordinal() % rec.period
+		else:
+			return rec.anchor.to_ordinal() % rec.period
+	
+	def _get_buckets(self, rec, create):
+		if isinstance(rec, recurrence.DaysBasedRecurrence):
+			if create:
+				return self._days_based.setdefault(rec.period, {})
+			return self._days_based.get(rec.period)
+		elif isinstance(rec, recurrence.MonthsBasedRecurrence):
+			key = (rec.ordinal, rec.day)
+			if key not in self._months_based:
+				if not create:
+					return None
+				self._months_based[key] = (rec, {})
+			by_period = self._months_based[key][1]
+			if create:
+				return by_period.setdefault(rec.period, {})
+			return by_period.get(rec.period)
+		else:
+			raise ValueError('Invalid recurrence instance: ' + repr(rec))
+	
+	def _drop_buckets(self, rec):
+		if isinstance(rec, recurrence.DaysBasedRecurrence):
+			del self._days_based[rec.period]
+		else:
+			key = (rec.ordinal, rec.day)
+			by_period = self._months_based[key][1]
+			del by_period[rec.period]
+			if not by_period:
+				del self._months_based[key]
@@ -0,0 +1,56 @@
+import mmap
+import ruleformat
+
+
+def write_store(path, rules):
+	with open(path, 'wb') as store_file:
+		store_file.write(ruleformat.encode_many(rules))
+
+
+class RuleStore(object):
+	
+	def __init__(self, path):
+		with open(path, 'rb') as store_file:
+			self._mmap = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+		try:
+			self._records = ruleformat.decode_records(self._mmap)
+		except Exception:
+			self._mmap.close()
+			raise
+		self._table = None
+	
+	@property
+	def records(self):
+		return self._records
+	
+	@property
+	def table(self):
+		if self._table is None:
+			self._table = ruleformat.records_to_table(self._records)
+		return self._table
+	
+	def get_recurrence(self, index):
+		return ruleformat.decode(self._records[index].tobytes())
+	
+	def close(self):
+		# Arrays handed out by the store keep the mapping alive through their
+		# base buffer, so it is only dropped here and unmapped once the last
+		# of them is collected
+		self._table = None
+		self._records = None
+		self._mmap = None
+	
+	def __len__(self):
+		return len(self._records)
+	
+	def __getitem__(self, index):
+		return self.get_recurrence(index)
+	
+	def __iter__(self):
+		return iter(self.table)
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
@@ -0,0 +1,194 @@
+import datetime
+import numpy
+import recurrence
+import yearmonth
+
+
+DAYS_BASED   = 0
+MONTHS_BASED = 1
+
+# Value stored in the days column for recurrence.DAY_OF_MONTH
+DAY_OF_MONTH = -1
+
+_MIN_ORDINAL = numpy.iinfo(numpy.int16).min
+_MAX_ORDINAL = numpy.iinfo(numpy.int16).max
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_NOT_A_TIME = numpy.datetime64('NaT', 'D')
+
+
+class RuleTable(object):
+	
+	def __init__(self, kinds, anchors, periods, ordinals, days):
+		self.kinds    = numpy.asarray(kinds,    dtype=numpy.int8)
+		self.anchors  = numpy.asarray(anchors,  dtype=numpy.int64)
+		self.periods  = numpy.asarray(periods,  dtype=numpy.int32)
+		self.ordinals = numpy.asarray(ordinals, dtype=numpy.int16)
+		self.days     = numpy.asarray(days,     dtype=numpy.int8)
+		
+		columns = (self.kinds, self.anchors, self.periods, self.ordinals, self.days)
+		if any(column.ndim != 1 or len(column) != len(self.kinds) for column in columns):
+			raise ValueError('All columns must be one-dimensional and have the same length')
+		if ((self.kinds != DAYS_BASED) & (self.kinds != MONTHS_BASED)).any():
+			raise ValueError('Invalid kind in rule table')
+		if ((self.days < DAY_OF_MONTH) | (self.days > recurrence.SUNDAY)).any():
+			raise ValueError('Invalid day in rule table')
+		
+		self._days_based_rows = numpy.flatnonzero(self.kinds == DAYS_BASED)
+		self._months_based_rows = numpy.flatnonzero(self.kinds == MONTHS_BASED)
+	
+	@staticmethod
+	def from_recurrences(recurrences):
+		recurrences = list(recurrences)
+		kinds    = numpy.empty(len(recurrences), dtype=numpy.int8)
+		anchors  = numpy.empty(len(recurrences), dtype=numpy.int64)
+		periods  = numpy.empty(len(recurrences), dtype=numpy.int32)
+		ordinals = numpy.zeros(len(recurrences), dtype=numpy.int16)
+		days     = numpy.full(len(recurrences), DAY_OF_MONTH, dtype=numpy.int8)
+		for row, rec in enumerate(recurrences):
+			if isinstance(rec, recurrence.DaysBasedRecurrence):
+				kinds[row] = DAYS_BASED
+				anchors[row] = rec.anchor.toordinal()
+			elif isinstance(rec, recurrence.MonthsBasedRecurrence):
+				kinds[row] = MONTHS_BASED
+				anchors[row] = rec.anchor.to_ordinal()
+				if not _MIN_ORDINAL <= rec.ordinal <= _MAX_ORDINAL:
+					raise ValueError('Ordinal out of range: ' + repr(rec.ordinal))
+				ordinals[row] = rec.ordinal
+				if rec.day != recurrence.DAY_OF_MONTH:
+					days[row] = rec.day
+			else:
+				raise ValueError('Invalid recurrence instance: ' + repr(rec))
+			periods[row] = rec.period
+		return RuleTable(kinds, anchors, periods, ordinals, days)
+	
+	def get_recurrence(self, row):
+		return _make_recurrence(int(self.kinds[row]), int(self.anchors[row]), int(self.periods[row]), int(self.ordinals[row]), int(self.days[row]))
+	
+	def get_occurrences(self, numbers):
+		numbers = self._broadcast(numbers, numpy.int64)
+		occurrences = numpy.empty(len(self), dtype='datetime64[D]')
+		
+		rows = self._days_based_rows
+		occurrence_days = self.anchors[rows] - _EPOCH_ORDINAL + numbers[rows] * self.periods[rows]
+		occurrences[rows] = occurrence_days.astype('datetime64[D]')
+		
+		rows = self._months_based_rows
+		ym_ordinals = self.anchors[rows] + numbers[rows] * self.periods[rows]
+		occurrences[rows] = self._dates_for_yearmonth_ordinals(rows, ym_ordinals)
+		
+		return occurrences
+	
+	def are_occurrences(self, candidates):
+		numbers, valid = self.get_occurrence_numbers(candidates)
+		return valid
+	
+	def get_occurrence_numbers(self, occurrences):
+		occurrences = self._broadcast_dates(occurrences)
+		numbers = numpy.empty(len(self), dtype=numpy.int64)
+		valid = numpy.empty(len(self), dtype=bool)
+		
+		rows = self._days_based_rows
+		deltas_days = occurrences[rows].astype(numpy.int64) - (self.anchors[rows] - _EPOCH_ORDINAL)
+		numbers[rows], remainders = numpy.divmod(deltas_days, self.periods[rows])
+		valid[rows] = remainders == 0
+		
+		rows = self._months_based_rows
+		ym_ordinals = _yearmonth_ordinals(occurrences[rows])
+		numbers[rows], remainders = numpy.divmod(ym_ordinals - self.anchors[rows], self.periods[rows])
+		expected = self._dates_for_yearmonth_ordinals(rows, ym_ordinals)
+		valid[rows] = (remainders == 0) & (expected == occurrences[rows])
+		
+		valid &= ~numpy.isnat(occurrences)
+		numbers[~valid] = 0
+		return numbers, valid
+	
+	def get_occurrences_after(self, dates):
+		dates = self._broadcast_dates(dates)
+		numbers = numpy.empty(len(self), dtype=numpy.int64)
+		
+		rows = self._days_based_rows
+		deltas_days = dates[rows].astype(numpy.int64) - (self.anchors[rows] - _EPOCH_ORDINAL)
+		numbers[rows] = deltas_days // self.periods[rows] + 1
+		
+		rows = self._months_based_rows
+		ym_ordinals = _yearmonth_ordinals(dates[rows])
+		quotients, remainders = numpy.divmod(ym_ordinals - self.anchors[rows], self.periods[rows])
+		same_month_occurrences = self._dates_for_yearmonth_ordinals(rows, ym_ordinals)
+		passed = numpy.isnat(same_month_occurrences) | (same_month_occurrences <= dates[rows])
+		numbers[rows] = quotients + ((remainders != 0) | passed)
+		
+		missing = numpy.isnat(dates)
+		numbers[missing] = 0
+		occurrences = self.get_occurrences(numbers)
+		occurrences[missing] = _NOT_A_TIME
+		return occurrences
+	
+	def _dates_for_yearmonth_ordinals(self, rows, ym_ordinals):
+		first_days, days_in_month = recurrence._month_bounds(ym_ordinals)
+		ordinals = self.ordinals[rows].astype(numpy.int64)
+		days = self.days[rows]
+		
+		days_of_month = numpy.empty(len(rows), dtype=numpy.int64)
+		days_of_month_rows = days == DAY_OF_MONTH
+		from_end_rows = ordinals < 0
+		first_days_of_week = recurrence._weekdays(first_days)
+		
+		case = days_of_month_rows & ~from_end_rows
+		days_of_month[case] = ordinals[case]
+		
+		case = days_of_month_rows & from_end_rows
+		days_of_month[case] = days_in_month[case] + ordinals[case] + 1
+		
+		case = ~days_of_month_rows & ~from_end_rows
+		days_of_month[case] = recurrence._weekday_days_of_month_from_start(
+				first_days_of_week[case], ordinals[case], days[case]
+			)
+		
+		case = ~days_of_month_rows & from_end_rows
+		days_of_month[case] = recurrence._weekday_days_of_month_from_end(
+				first_days_of_week[case], days_in_month[case], ordinals[case], days[case]
+			)
+		
+		# As in MonthsBasedRecurrence, only negative day-of-month ordinals may
+		# fall outside the month; any other day out of range has no occurrence
+		invalid = ~(days_of_month_rows & from_end_rows) & ((days_of_month < 1) | (days_of_month > days_in_month))
+		dates = first_days + (days_of_month - 1).astype('timedelta64[D]')
+		dates[invalid] = _NOT_A_TIME
+		return dates
+	
+	def _broadcast(self, values, dtype):
+		return numpy.broadcast_to(numpy.asarray(values, dtype=dtype), (len(self),))
+	
+	def _broadcast_dates(self, dates):
+		return self._broadcast(dates, 'datetime64[D]')
+	
+	def __len__(self):
+		return len(self.kinds)
+	
+	def __reduce__(self):
+		return (RuleTable, (self.kinds, self.anchors, self.periods, self.ordinals, self.days))
+	
+	def __getitem__(self, index):
+		if not isinstance(index, slice) and numpy.ndim(index) == 0:
+			return self.get_recurrence(index)
+		else:
+			return RuleTable(self.kinds[index], self.anchors[index], self.periods[index], self.ordinals[index], self.days[index])
+	
+	def __iter__(self):
+		columns = (self.kinds, self.anchors, self.periods, self.ordinals, self.days)
+		for row in zip(*[column.tolist() for column in columns]):
+			yield _make_recurrence(*row)
+
+
+def _make_recurrence(kind, anchor, period, ordinal, day):
+	if kind == DAYS_BASED:
+		return recurrence.DaysBasedRecurrence(datetime.date.fromordinal(anchor), period)
+	else:
+		if day == DAY_OF_MONTH:
+			day = recurrence.DAY_OF_MONTH
+		return recurrence.MonthsBasedRecurrence(yearmonth.YearMonth.from_ordinal(anchor), period, ordinal, day)
+
+
+def _yearmonth_ordinals(dates):
+	return dates.astype('datetime64[M]').astype(numpy.int64) + recurrence._EPOCH_YEARMONTH_ORDINAL
@@ -0,0 +1,149 @@
+import datetime
+import heapq
+import itertools
+import time
+
+
+_ONE_DAY = datetime.timedelta(days=1)
+
+
+class Timer(object):
+	
+	def __init__(self, recurrence, callback):
+		self.recurrence = recurrence
+		self.callback = callback
+		self._item = None
+	
+	@property
+	def occurrence(self):
+		if self._item is None:
+			return None
+		return self._item[0]
+	
+	@property
+	def cancelled(self):
+		return self._item is None
+
+
+class Scheduler(object):
+	
+	def __init__(self, clock=datetime.datetime.now, sleep=time.sleep):
+		self._clock = clock
+		self._sleep = sleep
+		# Heap items are [occurrence, serial, number, timer] lists; cancelled
+		# timers leave their item behind with timer set to None
+		self._heap = []
+		self._serials = itertools.count()
+		self._cancelled_items = 0
+		self._loop = None
+		self._loop_handle = None
+	
+	def add(self, recurrence, callback, start=None):
+		timer = Timer(recurrence, callback)
+		self._schedule(timer, start)
+		return timer
+	
+	def cancel(self, timer):
+		if timer._item is None:
+			raise ValueError('Timer is not scheduled')
+		self._drop_item(timer)
+	
+	def reschedule(self, timer, recurrence=None, start=None):
+		if timer._item is not None:
+			self._drop_item(timer)
+		if recurrence is not None:
+			timer.recurrence = recurrence
+		self._schedule(timer, start)
+	
+	def get_next_occurrence(self):
+		self._discard_cancelled()
+		if self._heap:
+			return self._heap[0][0]
+		return None
+	
+	def run_pending(self):
+		today = self._clock().date()
+		fired = 0
+		while True:
+			self._discard_cancelled()
+			if not self._heap or self._heap[0][0] > today:
+				return fired
+			item = self._heap[0]
+			occurrence, timer = item[0], item[3]
+			# The timer steps to its next occurrence before the callback runs,
+			# so that the callback may cancel or reschedule it
+			item[2] += 1
+			item[0] = timer.recurrence.get_occurrence(item[2])
+			heapq.heapreplace(self._heap, item)
+			timer.callback(occurrence)
+			fired += 1
+	
+	def run(self, until=None):
+		while True:
+			self.run_pending()
+			occurrence = self.get_next_occurrence()
+			if occurrence is None:
+				return
+			wake_time = datetime.datetime.combine(occurrence, datetime.time())
+			if until is not None and wake_time >= until:
+				return
+			delay = (wake_time - self._clock()).total_seconds()
+			if delay > 0:
+				self._sleep(delay)
+	
+	def attach(self, loop):
+		self.detach()
+		self._loop = loop
+		self._arm_loop()
+	
+	def detach(self):
+		if self._loop_handle is not None:
+			self._loop_handle.cancel()
+			self._loop_handle = None
+		self._loop = None
+	
+	def __len__(self):
+		return len(self._heap) - self._cancelled_items
+	
+	def _schedule(self, timer, start):
+		if start is None:
+			start = self._clock().date()
+		number = timer.recurrence._get_occurrence_number_after(start - _ONE_DAY)
+		item = [timer.recurrence.get_occurrence(number), next(self._serials), number, timer]
+		timer._item = item
+		heapq.heappush(self._heap, item)
+		if self._loop is not None and self._heap[0] is item:
+			self._arm_loop()
+	
+	def _drop_item(self, timer):
+		timer._item[3] = None
+		timer._item = None
+		self._cancelled_items += 1
+		# Rebuild the heap once cancelled items make up most of it
+		if self._cancelled_items > len(self._heap) // 2:
+			self._heap = [item for item in self._heap if item[3] is not None]
+			heapq.heapify(self._heap)
+			self._cancelled_items = 0
+	
+	def _discard_cancelled(self):
+		heap = self._heap
+		while heap and heap[0][3] is None:
+			heapq.heappop(heap)
+			self._cancelled_items -= 1
+	
+	def _arm_loop(self):
+		if self._loop_handle is not None:
+			self._loop_handle.cancel()
+			self._loop_handle = None
+		occurrence = self.get_next_occurrence()
+		if occurrence is None:
+			return
+		wake_time = datetime.datetime.combine(occurrence, datetime.time())
+		delay = max(0, (wake_time - self._clock()).total_seconds())
+		self._loop_handle = self._loop.call_later(delay, self._on_loop_timer)
+	
+	def _on_loop_timer(self):
+		self._loop_handle = None
+		self.run_pending()
+		if self._loop is not None:
+			self._arm_loop()
@@ -0,0 +1,29 @@
+from datetime import date, timedelta
+from yearmonth import YearMonth
+import recurrence
+
+
+# One rule of each shape: days-based, day of month and weekday, counted from
+# the start and from the end of the month
+SAMPLE_RECURRENCES = [
+	recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3),
+	recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=3, ordinal=7),
+	recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=3, ordinal=-7),
+	recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-28),
+	recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=4, ordinal=2, day=recurrence.TUESDAY),
+	recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=4, ordinal=-2, day=recurrence.TUESDAY),
+	recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=4, day=recurrence.SUNDAY),
+	recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1, day=recurrence.SATURDAY),
+]
+
+
+def make_recurrences(count):
+	# A mixed population of 5 * count rules with varied anchors and periods
+	recurrences = []
+	for i in range(count):
+		recurrences.append(recurrence.DaysBasedRecurrence(anchor=date(2012, 1, 1) + timedelta(days=i * 5), period=i % 9 + 1))
+		recurrences.append(recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, i % 12 + 1), period=i % 4 + 1, ordinal=i % 28 + 1))
+		recurrences.append(recurrence.MonthsBasedRecurrence(anchor=YearMonth(2011, i % 12 + 1), period=i % 3 + 1, ordinal=-(i % 5 + 1)))
+		recurrences.append(recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, i % 12 + 1), period=i % 5 + 1, ordinal=i % 4 + 1, day=i % 7))
+		recurrences.append(recurrence.MonthsBasedRecurrence(anchor=YearMonth(2013, i % 12 + 1), period=i % 2 + 1, ordinal=-(i % 4 + 1), day=(i * 3) % 7))
+	return recurrences
@@ -0,0 +1,89 @@
+import unittest
+from datetime import date
+from yearmonth import YearMonth
+import asyncrecurrence
+import recurrence
+
+
+def drive(async_iterator):
+	# Runs the iterator as an event loop would, counting the suspensions
+	items = []
+	suspensions = 0
+	while True:
+		try:
+			awaitable = async_iterator.__anext__()
+		except StopAsyncIteration:
+			return items, suspensions
+		steps = awaitable.__await__()
+		while True:
+			try:
+				next(steps)
+			except StopIteration as e:
+				items.append(e.value)
+				break
+			suspensions += 1
+
+
+def drive_one(async_iterator):
+	steps = async_iterator.__anext__().__await__()
+	while True:
+		try:
+			next(steps)
+		except StopIteration as e:
+			return e.value
+
+
+@unittest.skipIf(asyncrecurrence.asyncio is None, 'asyncio is not available')
+class TestAsyncRecurrence(unittest.TestCase):
+	
+	def setUp(self):
+		self.rec = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1, day=recurrence.SATURDAY)
+		self.after = date(2012, 1, 1)
+		self.before = date(2020, 1, 1)
+		self.expected = list(self.rec.generate_after(self.after, before=self.before))
+	
+	def testGenerateAfter(self):
+		items, suspensions = drive(asyncrecurrence.generate_after(self.rec, self.after, before=self.before, yield_every=10))
+		self.assertEquals(items, self.expected)
+		self.assertEquals(suspensions, len(self.expected) // 10)
+		
+		items, suspensions = drive(asyncrecurrence.generate_after(self.rec, self.after, before=self.before, with_numbers=True, yield_every=None))
+		self.assertEquals(items, list(self.rec.generate_after(self.after, before=self.before, with_numbers=True)))
+		self.assertEquals(suspensions, 0)
+	
+	def testGenerate(self):
+		async_iterator = asyncrecurrence.generate(self.rec, first_occurrence_number=3, direction=recurrence.PAST)
+		self.assertEquals([drive_one(async_iterator) for _ in range(5)], [self.rec.get_occurrence(number) for number in range(3, -2, -1)])
+	
+	def testBatches(self):
+		items, suspensions = drive(asyncrecurrence.generate_after(self.rec, self.after, before=self.before, batch_size=7, yield_every=2))
+		self.assertEquals([len(batch) for batch in items[:-1]], [7] * (len(items) - 1))
+		self.assertEquals([occurrence for batch in items for occurrence in batch], self.expected)
+		self.assertEquals(suspensions, len(items))
+		
+		items, suspensions = drive(asyncrecurrence.generate_after(self.rec, self.after, before=self.before, batch_size=7, yield_every=14))
+		self.assertEquals([occurrence for batch in items for occurrence in batch], self.expected)
+		self.assertEquals(suspensions, len(self.expected) // 14)
+		self.assertRaises(ValueError, lambda: asyncrecurrence.generate(self.rec, batch_size=0))
+	
+	def testTimeSlice(self):
+		items, suspensions = drive(asyncrecurrence.generate_after(self.rec, self.after, before=self.before, yield_every=None, time_slice=0))
+		self.assertEquals(items, self.expected)
+		self.assertEquals(suspensions, len(self.expected))
+	
+	def testTimeSliceStartsWithIteration(self):
+		now = [0.0]
+		original_clock = asyncrecurrence._clock
+		asyncrecurrence._clock = lambda: now[0]
+		try:
+			async_iterator = asyncrecurrence.generate_after(self.rec, self.after, before=self.before, yield_every=None, time_slice=5)
+			now[0] = 100.0
+			items, suspensions = drive(async_iterator)
+		finally:
+			asyncrecurrence._clock = original_clock
+		self.assertEquals(items, self.expected)
+		self.assertEquals(suspensions, 0)
+
+
+if __name__ == "__main__":
+	unittest.main()
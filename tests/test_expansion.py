@@ -0,0 +1,35 @@
+import unittest
+from datetime import date
+from ruletable import RuleTable
+import expansion
+from tests.fixtures import make_recurrences
+
+
+@unittest.skipIf(expansion.futures is None, 'concurrent.futures is not available')
+class TestExpansion(unittest.TestCase):
+	
+	def setUp(self):
+		self.recurrences = make_recurrences(15)
+		self.start = date(2012, 1, 1)
+		self.end = date(2014, 1, 1)
+		self.expected = [(index, list(rec.generate_after(self.start, before=self.end))) for index, rec in enumerate(self.recurrences)]
+	
+	def testExpand(self):
+		chunks = list(expansion.expand(self.recurrences, self.start, self.end, workers=2, chunk_size=7))
+		self.assertEquals([len(chunk) for chunk in chunks], [7] * 10 + [5])
+		self.assertEquals([item for chunk in chunks for item in chunk], self.expected)
+	
+	def testExpandTable(self):
+		table = RuleTable.from_recurrences(self.recurrences)
+		chunks = expansion.expand(table, self.start, self.end, workers=1, chunk_size=50)
+		self.assertEquals([item for chunk in chunks for item in chunk], self.expected)
+	
+	def testExpandEmpty(self):
+		self.assertEquals(list(expansion.expand([], self.start, self.end)), [])
+	
+	def testInvalidChunkSize(self):
+		self.assertRaises(ValueError, lambda: list(expansion.expand(self.recurrences, self.start, self.end, chunk_size=0)))
+
+
+if __name__ == "__main__":
+	unittest.main()
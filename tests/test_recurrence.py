@@ -1,8 +1,16 @@
 import unittest
-from datetime import date
+import copy
+import pickle
+from datetime import date, datetime, timedelta
 from itertools import izip, izip_longest
 from yearmonth import YearMonth
 import recurrence
+from tests.fixtures import SAMPLE_RECURRENCES
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
 
 
 class TestDaysBasedRecurrence(unittest.TestCase):
@@ -23,7 +31,15 @@ class TestDaysBasedRecurrence(unittest.TestCase):
 			self.dbr.period = 10
 		self.assertRaises(AttributeError, set_period)
 		
-		self.dbr.foo = 'bar'
+		def set_foo():
+			self.dbr.foo = 'bar'
+		self.assertRaises(AttributeError, set_foo)
+		
+		def del_anchor():
+			del self.dbr.anchor
+		self.assertRaises(AttributeError, del_anchor)
+		
+		self.assertFalse(hasattr(self.dbr, '__dict__'))
 	
 	def testComparisons(self):
 		# Equal
@@ -249,6 +265,28 @@ class TestDaysBasedRecurrence(unittest.TestCase):
 			self.assertEquals(occurrence, expected,
 					'occurrence=%r, expected=%r' % (occurrence, expected)
 				)
+	
+	def testIntersect(self):
+		for other_anchor, other_period in [
+					(date(2012, 4, 7), 3),
+					(date(2012, 4, 1), 5),
+					(date(2011, 1, 1), 4),
+					(date(2013, 6, 30), 6),
+					(date(2012, 4, 8), 6),
+					(date(2012, 4, 9), 1),
+				]:
+			other = recurrence.DaysBasedRecurrence(anchor=other_anchor, period=other_period)
+			common = [occurrence for occurrence in self.dbr.generate_after(date(2012, 1, 1), before=date(2013, 1, 1))
+					if other.is_occurrence(occurrence)]
+			intersection = self.dbr.intersect(other)
+			if common:
+				self.assertTrue(intersection.anchor >= self.dbr.anchor)
+				self.assertEquals(list(intersection.generate_after(date(2012, 1, 1), before=date(2013, 1, 1))), common)
+				self.assertEquals(intersection, other.intersect(self.dbr))
+			else:
+				self.assertEquals(intersection, None)
+		
+		self.assertRaises(ValueError, lambda: self.dbr.intersect(recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=3, ordinal=1)))
 
 
 class TestMonthsBasedRecurrence(unittest.TestCase):
@@ -281,7 +319,11 @@ class TestMonthsBasedRecurrence(unittest.TestCase):
 			self.mbr.recurrence.day = recurrence.MONDAY
 		self.assertRaises(AttributeError, set_day)
 		
-		self.mbr.foo = 'bar'
+		def set_foo():
+			self.mbr.foo = 'bar'
+		self.assertRaises(AttributeError, set_foo)
+		
+		self.assertFalse(hasattr(self.mbr, '__dict__'))
 	
 	
 	def testComparisons(self):
@@ -1146,6 +1188,314 @@ class TestMonthsBasedRecurrenceWithNegativeDayOfWeek(unittest.TestCase):
 				)
 
 
+@unittest.skipIf(numpy is None, 'NumPy is not available')
+class TestBatchOperations(unittest.TestCase):
+	
+	def testGetOccurrences(self):
+		numbers = range(-100, 100)
+		for rec in SAMPLE_RECURRENCES:
+			occurrences = rec.get_occurrences(numbers)
+			self.assertEquals(occurrences.dtype, numpy.dtype('datetime64[D]'))
+			for number, occurrence in izip(numbers, occurrences):
+				self.assertEquals(occurrence, numpy.datetime64(rec.get_occurrence(number), 'D'),
+						'recurrence=%r, number=%r' % (rec, number)
+					)
+	
+	def testGetOccurrencesKeepsShape(self):
+		rec = SAMPLE_RECURRENCES[1]
+		occurrences = rec.get_occurrences(numpy.arange(6).reshape(2, 3))
+		self.assertEquals(occurrences.shape, (2, 3))
+		self.assertEquals(occurrences[1, 2], numpy.datetime64(rec.get_occurrence(5), 'D'))
+	
+	def testGetOccurrencesWithInvalidDay(self):
+		rec = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=1, ordinal=31)
+		self.assertRaises(ValueError, lambda: rec.get_occurrence(1))
+		self.assertRaises(ValueError, lambda: rec.get_occurrences([0, 1, 2]))
+		
+		rec = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=1, ordinal=5, day=recurrence.MONDAY)
+		self.assertRaises(ValueError, lambda: rec.get_occurrence(1))
+		self.assertRaises(ValueError, lambda: rec.get_occurrences([0, 1, 2]))
+	
+	def testAreOccurrences(self):
+		candidates = numpy.arange('2011-01-01', '2014-01-01', dtype='datetime64[D]')
+		for rec in SAMPLE_RECURRENCES:
+			mask = rec.are_occurrences(candidates)
+			self.assertEquals(mask.dtype, numpy.dtype(bool))
+			self.assertTrue(mask.any())
+			for candidate, is_occurrence in izip(candidates.astype(object), mask):
+				self.assertEquals(is_occurrence, rec.is_occurrence(candidate),
+						'recurrence=%r, candidate=%r' % (rec, candidate)
+					)
+	
+	def testAreOccurrencesWithDates(self):
+		rec = SAMPLE_RECURRENCES[5]
+		mask = rec.are_occurrences([date(2011, 8, 23), date(2011, 9, 20), date(2012, 4, 17)])
+		self.assertEquals(list(mask), [True, False, True])
+	
+	def testAreOccurrencesWithInvalidDay(self):
+		rec = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=1, ordinal=31)
+		mask = rec.are_occurrences([date(2012, 1, 31), date(2012, 2, 29), date(2012, 3, 2), date(2012, 3, 31)])
+		self.assertEquals(list(mask), [True, False, False, True])
+	
+	def testGetOccurrenceNumbers(self):
+		candidates = numpy.arange('2011-01-01', '2014-01-01', dtype='datetime64[D]')
+		for rec in SAMPLE_RECURRENCES:
+			numbers, valid = rec.get_occurrence_numbers(candidates)
+			self.assertEquals(numbers.dtype, numpy.dtype(numpy.int64))
+			self.assertEquals(valid.dtype, numpy.dtype(bool))
+			for candidate, number, is_valid in izip(candidates.astype(object), numbers, valid):
+				if rec.is_occurrence(candidate):
+					self.assertTrue(is_valid)
+					self.assertEquals(number, rec.get_occurrence_number(candidate))
+				else:
+					self.assertFalse(is_valid)
+					self.assertRaises(ValueError, lambda: rec.get_occurrence_number(candidate))
+	
+	def testGetOccurrenceNumbersWithDates(self):
+		rec = SAMPLE_RECURRENCES[0]
+		numbers, valid = rec.get_occurrence_numbers([date(2012, 4, 1), date(2012, 4, 2), date(2012, 4, 10)])
+		self.assertEquals(list(valid), [True, False, True])
+		self.assertEquals(list(numbers[valid]), [-2, 1])
+
+
+class TestCycleTables(unittest.TestCase):
+	
+	def weekdays_of_month(self, ym, day):
+		days = [ym.get_date(day_of_month) for day_of_month in range(1, ym.get_days_in_month() + 1)]
+		return [current for current in days if current.weekday() == day]
+	
+	def testWeekdayRulesAcrossCycles(self):
+		for year in (1, 1601, 1899, 2000, 2399, 2400, 9999):
+			for month in range(1, 13):
+				ym = YearMonth(year, month)
+				for day in range(7):
+					expected_days = self.weekdays_of_month(ym, day)
+					for ordinal in (1, 2, 3, 4, 5, -1, -2, -3, -4, -5):
+						rec = recurrence.MonthsBasedRecurrence(anchor=ym, period=1, ordinal=ordinal, day=day)
+						if ordinal > 0:
+							expected = expected_days[ordinal - 1] if ordinal <= len(expected_days) else None
+						else:
+							expected = expected_days[ordinal] if -ordinal <= len(expected_days) else None
+						if expected is None:
+							self.assertRaises(ValueError, lambda: rec.get_occurrence(0))
+						else:
+							self.assertEquals(rec.get_occurrence(0), expected)
+							self.assertTrue(rec.is_occurrence(expected))
+							self.assertEquals(rec.get_occurrence_number(expected), 0)
+	
+	def testLastDayRulesAcrossCycles(self):
+		for year in (1, 1900, 2000, 2012, 2100, 9999):
+			for month in range(1, 13):
+				ym = YearMonth(year, month)
+				rec = recurrence.MonthsBasedRecurrence(anchor=ym, period=1, ordinal=-1)
+				self.assertEquals(rec.get_occurrence(0), ym.get_last_day())
+
+
+class TestDayOrdinalOperations(unittest.TestCase):
+	
+	def testGetOccurrenceOrdinal(self):
+		for rec in SAMPLE_RECURRENCES:
+			for number in range(-50, 50):
+				self.assertEquals(rec.get_occurrence_ordinal(number), rec.get_occurrence(number).toordinal())
+	
+	def testIsOccurrenceAndNumberOrdinal(self):
+		for rec in SAMPLE_RECURRENCES:
+			candidate = date(2011, 11, 1)
+			while candidate < date(2013, 3, 1):
+				day_ordinal = candidate.toordinal()
+				self.assertEquals(rec.is_occurrence_ordinal(day_ordinal), rec.is_occurrence(candidate))
+				if rec.is_occurrence(candidate):
+					self.assertEquals(rec.get_occurrence_number_ordinal(day_ordinal), rec.get_occurrence_number(candidate))
+				else:
+					self.assertRaises(ValueError, lambda: rec.get_occurrence_number_ordinal(day_ordinal))
+				self.assertEquals(rec.get_occurrence_ordinal_after(day_ordinal), rec.get_occurrence_after(candidate).toordinal())
+				candidate += timedelta(days=1)
+	
+	def testGenerateOrdinals(self):
+		for rec in SAMPLE_RECURRENCES:
+			for direction in (recurrence.FUTURE, recurrence.PAST):
+				generated = [day_ordinal for day_ordinal, _ in izip(rec.generate_ordinals(-3, direction), range(10))]
+				expected = [occurrence.toordinal() for occurrence, _ in izip(rec.generate(-3, direction), range(10))]
+				self.assertEquals(generated, expected)
+			
+			start, end = date(2012, 2, 10), date(2014, 2, 10)
+			self.assertEquals(list(rec.generate_ordinals_after(start.toordinal(), before=end.toordinal())),
+					[occurrence.toordinal() for occurrence in rec.generate_after(start, before=end)]
+				)
+
+
+class TestGenerateAfterWithNumbers(unittest.TestCase):
+	
+	def testYieldsNumbers(self):
+		for rec in SAMPLE_RECURRENCES:
+			generator = rec.generate_after(date(2012, 2, 10), before=date(2014, 2, 10), with_numbers=True)
+			pairs = list(generator)
+			self.assertTrue(pairs)
+			self.assertEquals([occurrence for number, occurrence in pairs],
+					list(rec.generate_after(date(2012, 2, 10), before=date(2014, 2, 10)))
+				)
+			for number, occurrence in pairs:
+				self.assertEquals(number, rec.get_occurrence_number(occurrence))
+			self.assertEquals(pairs[0][1], rec.get_occurrence_after(date(2012, 2, 10)))
+			for (_, previous), (_, occurrence) in izip(pairs, pairs[1:]):
+				self.assertEquals(occurrence, rec.get_occurrence_after(previous))
+
+
+class TestGenerateBefore(unittest.TestCase):
+	
+	def testGetOccurrenceBefore(self):
+		for rec in SAMPLE_RECURRENCES:
+			occurrences = list(rec.generate_after(date(2011, 12, 31), before=date(2013, 1, 1)))
+			candidate = occurrences[0] + timedelta(days=1)
+			while candidate <= occurrences[-1]:
+				expected = max(occurrence for occurrence in occurrences if occurrence < candidate)
+				self.assertEquals(rec.get_occurrence_before(candidate), expected,
+						'recurrence=%r, candidate=%r' % (rec, candidate)
+					)
+				candidate += timedelta(days=1)
+	
+	def testGenerateBefore(self):
+		for rec in SAMPLE_RECURRENCES:
+			expected = list(rec.generate_after(date(2011, 3, 14), before=date(2013, 5, 2)))
+			generated = list(rec.generate_before(date(2013, 5, 2), after=date(2011, 3, 14)))
+			self.assertEquals(generated, expected[::-1])
+	
+	def testGenerateBeforeUnbounded(self):
+		rec = SAMPLE_RECURRENCES[5]
+		EXPECTED = [
+			(-1, date(2011, 12, 20)),
+			(-2, date(2011,  8, 23)),
+			(-3, date(2011,  4, 19)),
+		]
+		generator = rec.generate_before(date(2012, 4, 17), with_numbers=True)
+		for pair, expected in izip(generator, EXPECTED):
+			self.assertEquals(pair, expected)
+
+
+class TestOccurrenceWindow(unittest.TestCase):
+	
+	def expected(self, rec, start, end):
+		return list(rec.generate_after(start - timedelta(days=1), before=end))
+	
+	def testMatchesGenerateAfter(self):
+		for rec in SAMPLE_RECURRENCES:
+			for start, end in [
+						(date(2012, 1, 1), date(2013, 1, 1)),
+						(date(2012, 4, 7), date(2012, 4, 8)),
+						(date(2012, 4, 8), date(2012, 4, 10)),
+						(date(2011, 2, 28), date(2015, 3, 1)),
+						(date(2013, 1, 1), date(2012, 1, 1)),
+					]:
+				window = rec.get_window(start, end)
+				expected = self.expected(rec, start, end)
+				self.assertEquals(list(window), expected, 'recurrence=%r' % rec)
+				self.assertEquals(len(window), len(expected))
+				self.assertEquals(rec.count_occurrences(start, end), len(expected))
+				self.assertEquals(list(reversed(window)), expected[::-1])
+				self.assertEquals(window.first(), expected[0] if expected else None)
+				self.assertEquals(window.last(), expected[-1] if expected else None)
+	
+	def testIndexingAndSlicing(self):
+		rec = SAMPLE_RECURRENCES[0]
+		window = rec.get_window(date(2012, 4, 8), date(2012, 5, 2))
+		expected = self.expected(rec, date(2012, 4, 8), date(2012, 5, 2))
+		self.assertEquals(len(expected), 8)
+		
+		for index in range(-8, 8):
+			self.assertEquals(window[index], expected[index])
+		self.assertRaises(IndexError, lambda: window[8])
+		self.assertRaises(IndexError, lambda: window[-9])
+		
+		for sl in [slice(2, 5), slice(None, None, 2), slice(None, None, -1), slice(-2, 1, -3), slice(5, 2), slice(1, None, 3)]:
+			self.assertEquals(list(window[sl]), expected[sl])
+			self.assertEquals(len(window[sl]), len(expected[sl]))
+		self.assertEquals(list(window[1::2][::-1]), expected[1::2][::-1])
+	
+	def testContains(self):
+		rec = SAMPLE_RECURRENCES[0]
+		window = rec.get_window(date(2012, 4, 8), date(2012, 5, 2))
+		self.assertTrue(date(2012, 4, 10) in window)
+		self.assertTrue(date(2012, 5, 1) in window)
+		self.assertFalse(date(2012, 4, 7) in window)
+		self.assertFalse(date(2012, 4, 11) in window)
+		self.assertFalse(date(2012, 5, 4) in window)
+		self.assertFalse(date(2012, 4, 10) in window[1::2])
+		self.assertTrue(date(2012, 4, 13) in window[1::2])
+	
+	def testLongHorizon(self):
+		rec = SAMPLE_RECURRENCES[0]
+		window = rec.get_window(date(1900, 1, 1), date(9000, 1, 1))
+		self.assertTrue(window[0] >= date(1900, 1, 1) > window[0] - timedelta(days=3))
+		self.assertTrue(window[-1] < date(9000, 1, 1) <= window[-1] + timedelta(days=3))
+		self.assertEquals(len(window), (window[-1] - window[0]).days // 3 + 1)
+
+
+class TestPickleAndCopy(unittest.TestCase):
+	
+	def testPickle(self):
+		for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+			for rec in SAMPLE_RECURRENCES:
+				unpickled = pickle.loads(pickle.dumps(rec, protocol))
+				self.assertEquals(unpickled, rec)
+				self.assertEquals(unpickled.__class__, rec.__class__)
+				self.assertEquals(unpickled.get_occurrence(5), rec.get_occurrence(5))
+				self.assertEquals(unpickled.get_occurrence_ordinal(-5), rec.get_occurrence_ordinal(-5))
+				self.assertRaises(AttributeError, lambda: setattr(unpickled, 'period', 2))
+	
+	def testPickleKeepsAnchorType(self):
+		rec = recurrence.DaysBasedRecurrence(datetime(2012, 4, 7, 10, 30), 3)
+		for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+			unpickled = pickle.loads(pickle.dumps(rec, protocol))
+			self.assertEquals(unpickled, rec)
+			self.assertEquals(type(unpickled.anchor), datetime)
+			self.assertEquals(unpickled.anchor, rec.anchor)
+			self.assertEquals(unpickled.get_occurrence(5), rec.get_occurrence(5))
+	
+	def testPickleSharesAnchors(self):
+		rules = [recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), period, 7) for period in range(1, 50)]
+		unpickled = pickle.loads(pickle.dumps(rules, 2))
+		self.assertEquals(unpickled, rules)
+		self.assertTrue(all(rec.anchor is YearMonth(2012, 4) for rec in unpickled))
+	
+	def testCopy(self):
+		for rec in SAMPLE_RECURRENCES:
+			self.assertTrue(copy.copy(rec) is rec)
+			self.assertTrue(copy.deepcopy(rec) is rec)
+			self.assertEquals(copy.deepcopy([rec, rec]), [rec, rec])
+
+
+class TestOccurrenceCursor(unittest.TestCase):
+	
+	def testStepping(self):
+		for rec in SAMPLE_RECURRENCES:
+			cursor = rec.get_cursor(number=3)
+			self.assertEquals(cursor.occurrence, rec.get_occurrence(3))
+			self.assertEquals(cursor.next(), rec.get_occurrence(4))
+			self.assertEquals(cursor.next(), rec.get_occurrence(5))
+			self.assertEquals(cursor.prev(), rec.get_occurrence(4))
+			self.assertEquals(cursor.advance(-10), rec.get_occurrence(-6))
+			self.assertEquals(cursor.number, -6)
+			self.assertEquals([occurrence for occurrence, _ in izip(cursor, range(3))], [rec.get_occurrence(number) for number in range(-5, -2)])
+	
+	def testSeek(self):
+		for rec in SAMPLE_RECURRENCES:
+			day = date(2012, 1, 1)
+			while day < date(2013, 1, 1):
+				cursor = rec.get_cursor(day)
+				occurrence = cursor.occurrence
+				self.assertEquals(occurrence, rec.get_occurrence_after(day - timedelta(days=1)))
+				self.assertEquals(cursor.next(), rec.get_occurrence_after(occurrence))
+				self.assertEquals(cursor.seek(day), rec.get_occurrence_after(day - timedelta(days=1)))
+				day += timedelta(days=5)
+	
+	def testPickle(self):
+		cursor = SAMPLE_RECURRENCES[4].get_cursor(date(2012, 7, 1))
+		cursor.next()
+		resumed = pickle.loads(pickle.dumps(cursor, 2))
+		self.assertEquals(resumed, cursor)
+		self.assertEquals(resumed.next(), cursor.next())
+		self.assertNotEqual(resumed, SAMPLE_RECURRENCES[4].get_cursor())
+
 
 if __name__ == "__main__":
 	#import sys;sys.argv = ['', 'Test.testName']
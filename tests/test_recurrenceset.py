@@ -0,0 +1,222 @@
+import unittest
+from datetime import date, timedelta
+from yearmonth import YearMonth
+from recurrenceset import RecurrenceSet, DateList, Union, Intersection, Difference
+import recurrence
+
+
+class TestRecurrenceSet(unittest.TestCase):
+	
+	def setUp(self):
+		self.dbr = recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=7)
+		self.mbr = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=3, day=recurrence.SATURDAY)
+		self.rs = RecurrenceSet()
+		self.rs.add(self.dbr, tag='weekly')
+		self.rs.add(self.mbr, tag='monthly')
+	
+	def testContainer(self):
+		self.assertEquals(len(self.rs), 2)
+		self.assertTrue('weekly' in self.rs)
+		self.assertFalse('daily' in self.rs)
+		self.assertEquals(sorted(self.rs), ['monthly', 'weekly'])
+		self.assertEquals(self.rs.get_recurrence('monthly'), self.mbr)
+		self.assertRaises(ValueError, lambda: self.rs.add(self.dbr, tag='weekly'))
+		
+		self.rs.remove('weekly')
+		self.assertEquals(len(self.rs), 1)
+		self.assertRaises(KeyError, lambda: self.rs.remove('weekly'))
+	
+	def testDefaultTagIsRecurrence(self):
+		rs = RecurrenceSet([self.dbr, self.mbr])
+		self.assertTrue(self.dbr in rs)
+		self.assertEquals(next(rs.generate_after(date(2012, 4, 20))), (date(2012, 4, 21), [self.dbr, self.mbr]))
+		
+		rs = RecurrenceSet([self.dbr, recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=7), self.mbr])
+		self.assertEquals(len(rs), 2)
+		self.assertEquals(next(rs.generate_after(date(2012, 4, 20))), (date(2012, 4, 21), [self.dbr, self.mbr]))
+		self.assertRaises(ValueError, lambda: rs.add(self.mbr, tag=self.dbr))
+	
+	def testGenerateAfter(self):
+		EXPECTED = [
+			(date(2012, 4, 14), ['weekly']),
+			(date(2012, 4, 21), ['weekly', 'monthly']),
+			(date(2012, 4, 28), ['weekly']),
+			(date(2012, 5,  5), ['weekly']),
+			(date(2012, 5, 12), ['weekly']),
+			(date(2012, 5, 19), ['weekly', 'monthly']),
+			(date(2012, 5, 26), ['weekly']),
+		]
+		self.assertEquals(list(self.rs.generate_after(date(2012, 4, 7), before=date(2012, 6, 2))), EXPECTED)
+	
+	def testGenerateAfterMatchesMembers(self):
+		rs = RecurrenceSet()
+		for period in range(2, 40):
+			rs.add(recurrence.DaysBasedRecurrence(anchor=date(2012, 1, 1) + timedelta(days=period), period=period))
+			rs.add(recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, period % 12 + 1), period=period % 5 + 1, ordinal=-(period % 4 + 1), day=period % 7))
+		
+		merged = list(rs.generate_after(date(2012, 3, 1), before=date(2013, 3, 1)))
+		dates = [occurrence for occurrence, tags in merged]
+		self.assertEquals(dates, sorted(set(dates)))
+		for occurrence, tags in merged:
+			self.assertEquals(set(tags), set(tag for tag in rs if rs.get_recurrence(tag).is_occurrence(occurrence)))
+			self.assertTrue(rs.is_occurrence(occurrence))
+		
+		count = sum(len(tags) for occurrence, tags in merged)
+		self.assertEquals(count, sum(len(list(rs.get_recurrence(tag).generate_after(date(2012, 3, 1), before=date(2013, 3, 1)))) for tag in rs))
+	
+	def testGetOccurrenceAfter(self):
+		self.assertEquals(self.rs.get_occurrence_after(date(2012, 4, 14)), date(2012, 4, 21))
+		self.assertFalse(self.rs.is_occurrence(date(2012, 4, 15)))
+		self.assertTrue(self.rs.is_occurrence(date(2012, 5, 19)))
+	
+	def testGetOccurrenceBefore(self):
+		self.assertEquals(self.rs.get_occurrence_before(date(2012, 4, 21)), date(2012, 4, 14))
+		self.assertEquals(self.rs.get_occurrence_before(date(2012, 4, 22)), date(2012, 4, 21))
+	
+	def testEmptySet(self):
+		self.rs.remove('weekly')
+		self.rs.remove('monthly')
+		self.assertEquals(self.rs.get_occurrence_after(date(2012, 4, 14)), None)
+		self.assertEquals(self.rs.get_occurrence_before(date(2012, 4, 14)), None)
+		self.assertFalse(self.rs.is_occurrence(date(2012, 4, 14)))
+	
+	def testAsOperand(self):
+		holidays = DateList([date(2012, 12, 25)])
+		self.assertEquals(Union(self.rs, holidays).get_occurrences_between(date(2012, 12, 1), date(2013, 1, 1)),
+				[date(2012, 12, 1), date(2012, 12, 8), date(2012, 12, 15), date(2012, 12, 22), date(2012, 12, 25), date(2012, 12, 29)]
+			)
+		self.assertEquals(Difference(self.rs, self.dbr).get_occurrence_after(date(2012, 4, 14)), None)
+		self.assertEquals(Difference(self.rs, self.dbr).get_occurrence_before(date(2012, 4, 14)), None)
+		self.rs.remove('weekly')
+		self.assertEquals(Difference(self.rs, holidays).get_occurrences_between(date(2012, 12, 1), date(2013, 1, 1)), [date(2012, 12, 15)])
+	
+	def testAddAndRemoveWhileIterating(self):
+		generator = self.rs.generate_after(date(2012, 4, 7))
+		self.assertEquals(next(generator), (date(2012, 4, 14), ['weekly']))
+		
+		self.rs.remove('weekly')
+		self.assertEquals(next(generator), (date(2012, 4, 21), ['monthly']))
+		
+		self.rs.add(recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 1), period=10), tag='tenth')
+		self.assertEquals(next(generator), (date(2012, 5, 1), ['tenth']))
+		self.assertEquals(next(generator), (date(2012, 5, 11), ['tenth']))
+		self.assertEquals(next(generator), (date(2012, 5, 19), ['monthly']))
+		
+		self.rs.remove('monthly')
+		self.rs.remove('tenth')
+		self.assertRaises(StopIteration, lambda: next(generator))
+		
+		self.rs.add(self.mbr, tag='monthly')
+		self.assertRaises(StopIteration, lambda: next(generator))
+	
+	def testExhaustedIteratorStaysExhausted(self):
+		generator = self.rs.generate_after(date(2012, 4, 7), before=date(2012, 4, 20))
+		self.assertEquals(list(generator), [(date(2012, 4, 14), ['weekly'])])
+		self.rs.add(recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 1), period=1), tag='daily')
+		self.assertRaises(StopIteration, lambda: next(generator))
+
+
+def brute_force(predicate, start, end):
+	occurrences = []
+	candidate = start
+	while candidate < end:
+		if predicate(candidate):
+			occurrences.append(candidate)
+		candidate += timedelta(days=1)
+	return occurrences
+
+
+class TestCombinations(unittest.TestCase):
+	
+	def setUp(self):
+		self.biweekly = recurrence.DaysBasedRecurrence(anchor=date(2012, 1, 6), period=14)
+		self.last_friday_of_quarter = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 3), period=3, ordinal=-1, day=recurrence.FRIDAY)
+		self.weekly = recurrence.DaysBasedRecurrence(anchor=date(2012, 1, 2), period=7)
+		self.holidays = DateList([date(2012, 12, 25), date(2012, 1, 2), date(2012, 7, 4)])
+	
+	def check(self, combination, predicate):
+		start, end = date(2012, 1, 1), date(2014, 1, 1)
+		expected = brute_force(predicate, start, end)
+		self.assertTrue(expected)
+		self.assertEquals(list(combination.generate_after(start - timedelta(days=1), before=end)), expected)
+		self.assertEquals(list(combination.generate_before(end, after=start - timedelta(days=1))), expected[::-1])
+		self.assertEquals(combination.get_occurrences_between(date(2012, 3, 1), date(2013, 3, 1)),
+				[occurrence for occurrence in expected if date(2012, 3, 1) <= occurrence < date(2013, 3, 1)]
+			)
+		self.assertEquals(combination.count_occurrences(date(2012, 3, 1), date(2013, 3, 1)),
+				len([occurrence for occurrence in expected if date(2012, 3, 1) <= occurrence < date(2013, 3, 1)])
+			)
+		for candidate in brute_force(lambda candidate: True, start, date(2012, 7, 1)):
+			self.assertEquals(combination.is_occurrence(candidate), predicate(candidate))
+	
+	def testDateList(self):
+		self.check(self.holidays, lambda candidate: candidate in (date(2012, 1, 2), date(2012, 7, 4), date(2012, 12, 25)))
+		self.assertEquals(self.holidays.get_occurrence_after(date(2012, 12, 25)), None)
+		self.assertEquals(self.holidays.get_occurrence_before(date(2012, 1, 2)), None)
+	
+	def testUnion(self):
+		union = Union(self.biweekly, self.last_friday_of_quarter, self.holidays)
+		self.check(union, lambda candidate: (self.biweekly.is_occurrence(candidate)
+				or self.last_friday_of_quarter.is_occurrence(candidate)
+				or self.holidays.is_occurrence(candidate)
+			))
+	
+	def testIntersection(self):
+		intersection = Intersection(self.biweekly, self.last_friday_of_quarter)
+		self.check(intersection, lambda candidate: (self.biweekly.is_occurrence(candidate)
+				and self.last_friday_of_quarter.is_occurrence(candidate)
+			))
+		self.assertEquals(Intersection(self.weekly, self.holidays).get_occurrences_between(date(2012, 1, 1), date(2013, 1, 1)),
+				[date(2012, 1, 2)]
+			)
+	
+	def testEmptyIntersection(self):
+		odd_days = recurrence.DaysBasedRecurrence(anchor=date(2012, 1, 1), period=2)
+		even_days = recurrence.DaysBasedRecurrence(anchor=date(2012, 1, 2), period=2)
+		for intersection in [
+			Intersection(odd_days, even_days),
+			Intersection(self.weekly, odd_days, even_days),
+			Intersection(Union(odd_days), even_days),
+			Intersection(self.weekly, self.biweekly, Difference(self.weekly, self.holidays), self.holidays),
+			Intersection(Union(self.weekly, odd_days), DateList([])),
+		]:
+			self.assertEquals(intersection.get_occurrence_after(date(2012, 1, 1)), None)
+			self.assertEquals(intersection.get_occurrence_before(date(2013, 1, 1)), None)
+			self.assertFalse(intersection.is_occurrence(date(2012, 1, 1)))
+			self.assertEquals(list(intersection.generate_after(date(2012, 1, 1))), [])
+		
+		intersection = Intersection(odd_days, self.weekly)
+		self.assertEquals(intersection.get_occurrence_after(date(2012, 1, 1)), date(2012, 1, 9))
+		self.assertEquals(intersection.get_occurrence_before(date(2012, 1, 9)), date(2011, 12, 26))
+		
+		self.assertRaises(ValueError, lambda: Intersection())
+	
+	def testFullyExcludedDifference(self):
+		for difference in [
+			Difference(self.weekly, self.weekly),
+			Difference(self.last_friday_of_quarter, self.last_friday_of_quarter),
+			Difference(self.biweekly, self.last_friday_of_quarter, Union(recurrence.DaysBasedRecurrence(anchor=date(2012, 1, 13), period=7))),
+			Difference(self.holidays, self.weekly, self.holidays),
+		]:
+			self.assertEquals(difference.get_occurrence_after(date(2012, 1, 1)), None)
+			self.assertEquals(difference.get_occurrence_before(date(2013, 1, 1)), None)
+			self.assertEquals(difference.get_occurrences_between(date(2012, 1, 1), date(2013, 1, 1)), [])
+	
+	def testDifference(self):
+		difference = Difference(self.biweekly, self.last_friday_of_quarter)
+		self.check(difference, lambda candidate: (self.biweekly.is_occurrence(candidate)
+				and not self.last_friday_of_quarter.is_occurrence(candidate)
+			))
+		difference = Difference(self.weekly, self.holidays)
+		self.check(difference, lambda candidate: self.weekly.is_occurrence(candidate) and not self.holidays.is_occurrence(candidate))
+	
+	def testNested(self):
+		combination = Difference(Union(self.weekly, self.last_friday_of_quarter), Intersection(self.weekly, self.holidays))
+		self.check(combination, lambda candidate: (
+				(self.weekly.is_occurrence(candidate) or self.last_friday_of_quarter.is_occurrence(candidate))
+				and not (self.weekly.is_occurrence(candidate) and self.holidays.is_occurrence(candidate))
+			))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from datetime import date, datetime
+from yearmonth import YearMonth
+import recurrence
+import rrule
+
+
+class TestRRule(unittest.TestCase):
+	
+	def testParseDaysBased(self):
+		self.assertEquals(rrule.parse('FREQ=DAILY;INTERVAL=14', date(2012, 4, 7)), recurrence.DaysBasedRecurrence(date(2012, 4, 7), 14))
+		self.assertEquals(rrule.parse('FREQ=DAILY', date(2012, 4, 7)), recurrence.DaysBasedRecurrence(date(2012, 4, 7), 1))
+		self.assertEquals(rrule.parse('RRULE:freq=weekly;interval=2;byday=SA', date(2012, 4, 7)), recurrence.DaysBasedRecurrence(date(2012, 4, 7), 14))
+		self.assertEquals(rrule.parse('FREQ=WEEKLY', datetime(2012, 4, 7, 10, 30)), recurrence.DaysBasedRecurrence(date(2012, 4, 7), 7))
+	
+	def testParseMonthsBased(self):
+		anchor = YearMonth(2012, 4)
+		self.assertEquals(rrule.parse('FREQ=MONTHLY;INTERVAL=2;BYDAY=-1SA', date(2012, 4, 7)), recurrence.MonthsBasedRecurrence(anchor, 2, -1, recurrence.SATURDAY))
+		self.assertEquals(rrule.parse('FREQ=MONTHLY;BYDAY=+2TU', date(2012, 4, 7)), recurrence.MonthsBasedRecurrence(anchor, 1, 2, recurrence.TUESDAY))
+		self.assertEquals(rrule.parse('FREQ=MONTHLY;BYMONTHDAY=-3;WKST=MO', date(2012, 4, 7)), recurrence.MonthsBasedRecurrence(anchor, 1, -3))
+		self.assertEquals(rrule.parse('FREQ=MONTHLY;INTERVAL=3', date(2012, 4, 7)), recurrence.MonthsBasedRecurrence(anchor, 3, 7))
+		self.assertEquals(rrule.parse('FREQ=YEARLY;BYMONTH=4;BYMONTHDAY=24', date(2012, 4, 7)), recurrence.MonthsBasedRecurrence(anchor, 12, 24))
+		self.assertEquals(rrule.parse('FREQ=YEARLY;BYMONTH=4;BYDAY=1MO', date(2012, 4, 7)), recurrence.MonthsBasedRecurrence(anchor, 12, 1, recurrence.MONDAY))
+		self.assertEquals(rrule.parse('FREQ=YEARLY;INTERVAL=2', date(2012, 4, 7)), recurrence.MonthsBasedRecurrence(anchor, 24, 7))
+	
+	def testParseUnsupported(self):
+		for rule in [
+			'FREQ=HOURLY',
+			'FREQ=DAILY;COUNT=10',
+			'FREQ=DAILY;UNTIL=20121231',
+			'FREQ=DAILY;BYDAY=MO',
+			'FREQ=WEEKLY;BYDAY=MO,WE',
+			'FREQ=WEEKLY;BYDAY=MO',
+			'FREQ=MONTHLY;BYDAY=SA',
+			'FREQ=MONTHLY;BYDAY=6SA',
+			'FREQ=MONTHLY;BYDAY=5FR',
+			'FREQ=MONTHLY;BYDAY=-5FR',
+			'FREQ=MONTHLY;BYMONTHDAY=31',
+			'FREQ=MONTHLY;INTERVAL=3;BYMONTHDAY=31',
+			'FREQ=MONTHLY;BYMONTHDAY=29',
+			'FREQ=YEARLY;INTERVAL=4;BYMONTH=2;BYMONTHDAY=29',
+			'FREQ=MONTHLY;BYMONTHDAY=-31',
+			'FREQ=MONTHLY;BYMONTHDAY=1,15',
+			'FREQ=MONTHLY;BYMONTHDAY=1;BYDAY=1MO',
+			'FREQ=YEARLY;BYMONTH=5',
+			'FREQ=YEARLY;BYDAY=1MO',
+			'FREQ=YEARLY;BYMONTHDAY=24',
+			'FREQ=DAILY;INTERVAL=0',
+			'FREQ=DAILY;FREQ=DAILY',
+			'FREQ',
+			'',
+		]:
+			self.assertRaises(ValueError, lambda: rrule.parse(rule, date(2012, 4, 7) if 'BYMONTH=' not in rule else date(2012, 2, 7)))
+		for rule, dtstart in [
+			('FREQ=MONTHLY', date(2012, 1, 31)),
+			('FREQ=MONTHLY;INTERVAL=3', date(2012, 1, 31)),
+			('FREQ=YEARLY', date(2012, 2, 29)),
+		]:
+			self.assertRaises(ValueError, lambda: rrule.parse(rule, dtstart))
+	
+	def testParseLongMonthDays(self):
+		self.assertEquals(rrule.parse('FREQ=MONTHLY;INTERVAL=12;BYMONTHDAY=31', date(2012, 1, 1)), recurrence.MonthsBasedRecurrence(YearMonth(2012, 1), 12, 31))
+		self.assertEquals(rrule.parse('FREQ=YEARLY;BYMONTH=7;BYMONTHDAY=31', date(2012, 7, 1)), recurrence.MonthsBasedRecurrence(YearMonth(2012, 7), 12, 31))
+		self.assertEquals(rrule.parse('FREQ=MONTHLY;INTERVAL=2', date(2012, 3, 30)), recurrence.MonthsBasedRecurrence(YearMonth(2012, 3), 2, 30))
+		self.assertEquals(rrule.parse('FREQ=YEARLY', date(2012, 1, 31)), recurrence.MonthsBasedRecurrence(YearMonth(2012, 1), 12, 31))
+	
+	def testParseMany(self):
+		items = [
+			('FREQ=DAILY;INTERVAL=14', date(2012, 4, 7)),
+			('FREQ=SECONDLY', date(2012, 4, 7)),
+			('FREQ=MONTHLY;INTERVAL=2;BYDAY=-1SA', date(2012, 4, 7)),
+			('FREQ=SECONDLY', date(2012, 4, 7)),
+			('FREQ=DAILY;INTERVAL=14', date(2012, 4, 8)),
+			('FREQ=MONTHLY;BYMONTHDAY=31', date(2012, 1, 31)),
+		]
+		recurrences, errors = rrule.parse_many(items)
+		self.assertEquals(recurrences, [
+			recurrence.DaysBasedRecurrence(date(2012, 4, 7), 14),
+			None,
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 2, -1, recurrence.SATURDAY),
+			None,
+			recurrence.DaysBasedRecurrence(date(2012, 4, 8), 14),
+			None,
+		])
+		self.assertEquals([(index, rule) for index, rule, message in errors], [(1, 'FREQ=SECONDLY'), (3, 'FREQ=SECONDLY'), (5, 'FREQ=MONTHLY;BYMONTHDAY=31')])
+	
+	def testFormat(self):
+		self.assertEquals(rrule.format(recurrence.DaysBasedRecurrence(date(2012, 4, 7), 1)), 'FREQ=DAILY')
+		self.assertEquals(rrule.format(recurrence.DaysBasedRecurrence(date(2012, 4, 7), 3)), 'FREQ=DAILY;INTERVAL=3')
+		self.assertEquals(rrule.format(recurrence.DaysBasedRecurrence(date(2012, 4, 7), 14)), 'FREQ=WEEKLY;INTERVAL=2')
+		self.assertEquals(rrule.format(recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 2, -1, recurrence.SATURDAY)), 'FREQ=MONTHLY;INTERVAL=2;BYDAY=-1SA')
+		self.assertEquals(rrule.format(recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, 15)), 'FREQ=MONTHLY;BYMONTHDAY=15')
+		self.assertRaises(ValueError, lambda: rrule.format(None))
+	
+	def testFormatUnsupported(self):
+		for rec in [
+			recurrence.DaysBasedRecurrence(date(2012, 4, 7), 0),
+			recurrence.DaysBasedRecurrence(date(2012, 4, 7), -3),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), -3, 7),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, 0),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, 32),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, -30),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, 7, recurrence.MONDAY),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, 0, recurrence.MONDAY),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, -6, recurrence.MONDAY),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 3, 31),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 1), 1, 29),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 2), 12, 29),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, 5, recurrence.FRIDAY),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, -5, recurrence.MONDAY),
+		]:
+			self.assertRaises(ValueError, lambda: rrule.format(rec))
+	
+	def testRoundTrip(self):
+		for rec in [
+			recurrence.DaysBasedRecurrence(date(2012, 4, 7), 3),
+			recurrence.DaysBasedRecurrence(date(2012, 4, 7), 21),
+			recurrence.DaysBasedRecurrence(date(2012, 4, 7), 1),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 1), 12, 31),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 1), 6, 31),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 3, 30),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, 28),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 3, 1),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 3, -7),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, -28),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 12, -1),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, 4, recurrence.FRIDAY),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, -4, recurrence.MONDAY),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 4, 2, recurrence.TUESDAY),
+			recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 4, -2, recurrence.SUNDAY),
+		]:
+			self.assertEquals(rrule.parse(rrule.format(rec), rrule.get_dtstart(rec)), rec)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from datetime import date
+from yearmonth import YearMonth
+from ruletable import RuleTable
+import ruleformat
+import recurrence
+from tests.fixtures import SAMPLE_RECURRENCES
+
+
+# Extreme anchors and periods on top of the shared sample
+RECURRENCES = SAMPLE_RECURRENCES + [
+	recurrence.DaysBasedRecurrence(anchor=date(1, 1, 1), period=1),
+	recurrence.DaysBasedRecurrence(anchor=date(9999, 12, 31), period=100000),
+]
+
+
+class TestRuleFormat(unittest.TestCase):
+	
+	def testEncodeDecode(self):
+		for rec in RECURRENCES:
+			data = ruleformat.encode(rec)
+			self.assertEquals(len(data), ruleformat.RECORD_SIZE)
+			self.assertEquals(ruleformat.decode(data), rec)
+	
+	def testEncodeDecodeMany(self):
+		data = ruleformat.encode_many(RECURRENCES)
+		self.assertEquals(len(data), ruleformat.HEADER_SIZE + len(RECURRENCES) * ruleformat.RECORD_SIZE)
+		self.assertEquals(ruleformat.decode_many(data), RECURRENCES)
+		self.assertEquals(list(ruleformat.decode_table(data)), RECURRENCES)
+		
+		table = RuleTable.from_recurrences(RECURRENCES)
+		self.assertEquals(ruleformat.encode_many(table), data)
+		self.assertEquals(ruleformat.decode_many(ruleformat.encode_many([])), [])
+	
+	def testRecordLayout(self):
+		data = ruleformat.encode(recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=3, ordinal=-2, day=recurrence.TUESDAY))
+		self.assertEquals(data, b'\x01\x01\xfe\xff\x03\x00\x00\x00' + b'\x53\x5e\x00\x00\x00\x00\x00\x00')
+		self.assertEquals(ruleformat.encode_header(2)[:8], b'RREC\x01\x00\x10\x00')
+	
+	def testInvalidBuffers(self):
+		data = ruleformat.encode_many(RECURRENCES)
+		self.assertRaises(ValueError, lambda: ruleformat.decode_many(data[:10]))
+		self.assertRaises(ValueError, lambda: ruleformat.decode_many(data[:-1]))
+		self.assertRaises(ValueError, lambda: ruleformat.decode_many(b'XXXX' + data[4:]))
+		self.assertRaises(ValueError, lambda: ruleformat.decode_many(data[:4] + b'\x02' + data[5:]))
+		self.assertRaises(ValueError, lambda: ruleformat.decode_many(data[:6] + b'\x20' + data[7:]))
+		self.assertRaises(ValueError, lambda: ruleformat.encode(recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=3, ordinal=40000)))
+		self.assertRaises(ValueError, lambda: ruleformat.encode(recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=2 ** 40)))
+		self.assertRaises(ValueError, lambda: ruleformat.encode(None))
+		self.assertRaises(ValueError, lambda: ruleformat.decode(b'\x02' + ruleformat.encode(RECURRENCES[0])[1:]))
+		self.assertRaises(ValueError, lambda: ruleformat.decode(b'\x01\x07' + ruleformat.encode(RECURRENCES[0])[2:]))
+
+
+if __name__ == "__main__":
+	unittest.main()
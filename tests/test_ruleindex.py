@@ -0,0 +1,56 @@
+import unittest
+from datetime import date, timedelta
+from yearmonth import YearMonth
+from ruleindex import RecurrenceIndex
+import recurrence
+from tests.fixtures import make_recurrences
+
+
+class TestRecurrenceIndex(unittest.TestCase):
+	
+	def setUp(self):
+		self.recurrences = make_recurrences(60)
+		self.index = RecurrenceIndex(self.recurrences)
+	
+	def linear_scan(self, candidate):
+		return set(rec for rec in self.recurrences if rec.is_occurrence(candidate))
+	
+	def testFind(self):
+		self.assertEquals(len(self.index), len(set(self.recurrences)))
+		candidate = date(2012, 1, 1)
+		while candidate < date(2013, 1, 1):
+			self.assertEquals(self.index.find(candidate), self.linear_scan(candidate), 'candidate=%r' % candidate)
+			candidate += timedelta(days=1)
+	
+	def testFindBetween(self):
+		found = list(self.index.find_between(date(2012, 4, 2), date(2012, 4, 9)))
+		expected = [(candidate, self.linear_scan(candidate))
+				for candidate in (date(2012, 4, 2) + timedelta(days=i) for i in range(7))
+				if self.linear_scan(candidate)]
+		self.assertEquals(found, expected)
+	
+	def testAddAndRemove(self):
+		rec = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=7, ordinal=-2, day=recurrence.TUESDAY)
+		self.assertFalse(rec in self.index)
+		self.index.add(rec)
+		self.assertTrue(rec in self.index)
+		self.assertTrue(rec in self.index.find(date(2012, 4, 17)))
+		
+		self.index.remove(rec)
+		self.assertFalse(rec in self.index)
+		self.assertFalse(rec in self.index.find(date(2012, 4, 17)))
+		self.assertRaises(KeyError, lambda: self.index.remove(rec))
+		
+		for rec in self.recurrences:
+			if rec in self.index:
+				self.index.remove(rec)
+		self.assertEquals(len(self.index), 0)
+		self.assertEquals(self.index.find(date(2012, 4, 17)), set())
+	
+	def testInvalidRecurrence(self):
+		self.assertRaises(ValueError, lambda: self.index.add(object()))
+		self.assertFalse(object() in self.index)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+import numpy
+from ruletable import RuleTable
+from rulestore import RuleStore, write_store
+from tests.fixtures import SAMPLE_RECURRENCES
+
+
+class TestRuleStore(unittest.TestCase):
+	
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.path = os.path.join(self.directory, 'rules.bin')
+		write_store(self.path, SAMPLE_RECURRENCES)
+	
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+	
+	def testLazyRecurrences(self):
+		with RuleStore(self.path) as store:
+			self.assertEquals(len(store), len(SAMPLE_RECURRENCES))
+			for index, rec in enumerate(SAMPLE_RECURRENCES):
+				self.assertEquals(store[index], rec)
+			self.assertEquals(store[-1], SAMPLE_RECURRENCES[-1])
+			self.assertEquals(list(store), SAMPLE_RECURRENCES)
+	
+	def testZeroCopyTable(self):
+		with RuleStore(self.path) as store:
+			table = store.table
+			self.assertFalse(table.anchors.flags.owndata)
+			self.assertFalse(table.anchors.flags.writeable)
+			self.assertTrue(numpy.may_share_memory(table.anchors, store.records))
+			del table
+	
+	def testVectorizedEvaluation(self):
+		expected_table = RuleTable.from_recurrences(SAMPLE_RECURRENCES)
+		with RuleStore(self.path) as store:
+			for number in range(-5, 5):
+				self.assertEquals(list(store.table.get_occurrences(number)), list(expected_table.get_occurrences(number)))
+			candidate = date(2012, 1, 1)
+			while candidate < date(2013, 1, 1):
+				self.assertEquals(list(store.table.are_occurrences(candidate)), [rec.is_occurrence(candidate) for rec in SAMPLE_RECURRENCES])
+				candidate += timedelta(days=1)
+	
+	def testTableOutlivesStore(self):
+		store = RuleStore(self.path)
+		table = store.table
+		records = store.records
+		store.close()
+		self.assertEquals(list(table), SAMPLE_RECURRENCES)
+		self.assertEquals(len(records), len(SAMPLE_RECURRENCES))
+		
+		with RuleStore(self.path) as store:
+			table = store.table
+		self.assertEquals(list(table.anchors), list(RuleTable.from_recurrences(SAMPLE_RECURRENCES).anchors))
+		del table
+	
+	def testWriteFromTable(self):
+		write_store(self.path, RuleTable.from_recurrences(SAMPLE_RECURRENCES[:2]))
+		with RuleStore(self.path) as store:
+			self.assertEquals(list(store), SAMPLE_RECURRENCES[:2])
+	
+	def testInvalidFile(self):
+		with open(self.path, 'r+b') as store_file:
+			store_file.write(b'XXXX')
+		self.assertRaises(ValueError, lambda: RuleStore(self.path))
+
+
+if __name__ == "__main__":
+	unittest.main()
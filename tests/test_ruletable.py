@@ -0,0 +1,103 @@
+import unittest
+import pickle
+from datetime import date, timedelta
+from itertools import izip
+import numpy
+from yearmonth import YearMonth
+from ruletable import RuleTable
+import ruletable
+import recurrence
+from tests.fixtures import make_recurrences
+
+
+class TestRuleTable(unittest.TestCase):
+	
+	def setUp(self):
+		self.recurrences = make_recurrences(40)
+		self.table = RuleTable.from_recurrences(self.recurrences)
+	
+	def testRoundTrip(self):
+		self.assertEquals(len(self.table), len(self.recurrences))
+		self.assertEquals(list(self.table), self.recurrences)
+		self.assertEquals(self.table[7], self.recurrences[7])
+		self.assertEquals(self.table[-1], self.recurrences[-1])
+		self.assertEquals(list(self.table[3:9]), self.recurrences[3:9])
+		self.assertEquals(list(self.table[self.table.kinds == ruletable.DAYS_BASED]),
+				[rec for rec in self.recurrences if isinstance(rec, recurrence.DaysBasedRecurrence)]
+			)
+	
+	def testColumns(self):
+		table = RuleTable(
+				kinds=[ruletable.DAYS_BASED, ruletable.MONTHS_BASED, ruletable.MONTHS_BASED],
+				anchors=[date(2012, 4, 7).toordinal(), YearMonth(2012, 4).to_ordinal(), YearMonth(2012, 4).to_ordinal()],
+				periods=[3, 3, 4],
+				ordinals=[0, 7, -2],
+				days=[ruletable.DAY_OF_MONTH, ruletable.DAY_OF_MONTH, recurrence.TUESDAY],
+			)
+		self.assertEquals(list(table), [
+				recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3),
+				recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=3, ordinal=7),
+				recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=4, ordinal=-2, day=recurrence.TUESDAY),
+			])
+		self.assertEquals(table.anchors.dtype, numpy.dtype(numpy.int64))
+		self.assertEquals(table.periods.dtype, numpy.dtype(numpy.int32))
+	
+	def testInvalidColumns(self):
+		self.assertRaises(ValueError, lambda: RuleTable([0, 1], [0, 0], [1, 1], [0, 1], [-1]))
+		self.assertRaises(ValueError, lambda: RuleTable([2], [0], [1], [0], [-1]))
+		self.assertRaises(ValueError, lambda: RuleTable([1], [0], [1], [1], [7]))
+		self.assertRaises(ValueError, lambda: RuleTable.from_recurrences([object()]))
+	
+	def testGetOccurrences(self):
+		for number in range(-13, 13):
+			occurrences = self.table.get_occurrences(number)
+			for rec, occurrence in izip(self.recurrences, occurrences):
+				self.assertEquals(occurrence, numpy.datetime64(rec.get_occurrence(number), 'D'))
+		
+		numbers = numpy.arange(len(self.table)) % 17 - 8
+		occurrences = self.table.get_occurrences(numbers)
+		for rec, number, occurrence in izip(self.recurrences, numbers, occurrences):
+			self.assertEquals(occurrence, numpy.datetime64(rec.get_occurrence(number), 'D'))
+	
+	def testGetOccurrencesWithInvalidDay(self):
+		table = RuleTable.from_recurrences([
+				recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=1, ordinal=31),
+				recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=1, ordinal=5, day=recurrence.MONDAY),
+			])
+		self.assertEquals(list(numpy.isnat(table.get_occurrences(0))), [False, False])
+		self.assertEquals(list(numpy.isnat(table.get_occurrences(1))), [True, True])
+	
+	def testGetOccurrenceNumbers(self):
+		candidate = date(2012, 1, 1)
+		while candidate < date(2013, 1, 1):
+			numbers, valid = self.table.get_occurrence_numbers(candidate)
+			self.assertEquals(list(self.table.are_occurrences(candidate)), list(valid))
+			for rec, number, is_valid in izip(self.recurrences, numbers, valid):
+				self.assertEquals(is_valid, rec.is_occurrence(candidate))
+				if is_valid:
+					self.assertEquals(number, rec.get_occurrence_number(candidate))
+			candidate += timedelta(days=1)
+	
+	def testGetOccurrencesAfter(self):
+		candidate = date(2012, 1, 1)
+		while candidate < date(2012, 7, 1):
+			occurrences = self.table.get_occurrences_after(candidate)
+			for rec, occurrence in izip(self.recurrences, occurrences):
+				self.assertEquals(occurrence, numpy.datetime64(rec.get_occurrence_after(candidate), 'D'))
+			candidate += timedelta(days=1)
+		
+		dates = numpy.datetime64('2012-01-01') + numpy.arange(len(self.table)) * 11
+		occurrences = self.table.get_occurrences_after(dates)
+		for rec, day, occurrence in izip(self.recurrences, dates.astype(object), occurrences):
+			self.assertEquals(occurrence, numpy.datetime64(rec.get_occurrence_after(day), 'D'))
+
+	
+	def testPickle(self):
+		for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+			table = pickle.loads(pickle.dumps(self.table, protocol))
+			self.assertEquals(list(table), self.recurrences)
+			self.assertEquals(list(table.get_occurrences(3)), list(self.table.get_occurrences(3)))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+from datetime import date, datetime, timedelta
+from yearmonth import YearMonth
+from scheduler import Scheduler
+import recurrence
+
+try:
+	import asyncio
+except ImportError:
+	asyncio = None
+
+
+class FakeClock(object):
+	
+	def __init__(self, now):
+		self.now = now
+		self.sleeps = []
+	
+	def __call__(self):
+		return self.now
+	
+	def sleep(self, seconds):
+		self.sleeps.append(seconds)
+		self.now += timedelta(seconds=seconds)
+
+
+class TestScheduler(unittest.TestCase):
+	
+	def setUp(self):
+		self.clock = FakeClock(datetime(2012, 4, 7, 12, 0))
+		self.scheduler = Scheduler(clock=self.clock, sleep=self.clock.sleep)
+		self.fired = []
+		self.every_three_days = recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3)
+		self.last_saturday = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1, day=recurrence.SATURDAY)
+	
+	def callback(self, name):
+		return lambda occurrence: self.fired.append((name, occurrence))
+	
+	def testAdd(self):
+		timer = self.scheduler.add(self.every_three_days, self.callback('a'))
+		self.assertEquals(timer.occurrence, date(2012, 4, 7))
+		timer = self.scheduler.add(self.every_three_days, self.callback('a'), start=date(2012, 4, 8))
+		self.assertEquals(timer.occurrence, date(2012, 4, 10))
+		self.assertEquals(len(self.scheduler), 2)
+	
+	def testRunPending(self):
+		self.scheduler.add(self.every_three_days, self.callback('a'))
+		self.scheduler.add(self.last_saturday, self.callback('b'))
+		self.assertEquals(self.scheduler.run_pending(), 1)
+		self.assertEquals(self.fired, [('a', date(2012, 4, 7))])
+		self.assertEquals(self.scheduler.run_pending(), 0)
+		
+		self.clock.now = datetime(2012, 4, 28)
+		self.assertEquals(self.scheduler.run_pending(), 8)
+		self.assertEquals(self.fired[-2:], [('a', date(2012, 4, 28)), ('b', date(2012, 4, 28))])
+		self.assertEquals(self.scheduler.get_next_occurrence(), date(2012, 5, 1))
+	
+	def testCancel(self):
+		timer = self.scheduler.add(self.every_three_days, self.callback('a'))
+		self.scheduler.add(self.last_saturday, self.callback('b'))
+		self.scheduler.cancel(timer)
+		self.assertTrue(timer.cancelled)
+		self.assertEquals(len(self.scheduler), 1)
+		self.assertRaises(ValueError, lambda: self.scheduler.cancel(timer))
+		self.clock.now = datetime(2012, 4, 28)
+		self.scheduler.run_pending()
+		self.assertEquals(self.fired, [('b', date(2012, 4, 28))])
+	
+	def testCancelMany(self):
+		timers = [self.scheduler.add(self.every_three_days, self.callback(i)) for i in range(100)]
+		for timer in timers[:90]:
+			self.scheduler.cancel(timer)
+		self.assertEquals(len(self.scheduler), 10)
+		self.assertTrue(len(self.scheduler._heap) < 50)
+		self.scheduler.run_pending()
+		self.assertEquals([name for name, occurrence in self.fired], list(range(90, 100)))
+	
+	def testReschedule(self):
+		timer = self.scheduler.add(self.every_three_days, self.callback('a'))
+		self.scheduler.reschedule(timer, start=date(2012, 4, 8))
+		self.assertEquals(timer.occurrence, date(2012, 4, 10))
+		self.scheduler.reschedule(timer, recurrence=self.last_saturday)
+		self.assertEquals(timer.occurrence, date(2012, 4, 28))
+		self.assertEquals(len(self.scheduler), 1)
+		self.scheduler.cancel(timer)
+		self.scheduler.reschedule(timer)
+		self.assertEquals(len(self.scheduler), 1)
+	
+	def testCallbackCancelsItself(self):
+		timers = []
+		def callback(occurrence):
+			self.fired.append(occurrence)
+			self.scheduler.cancel(timers[0])
+		timers.append(self.scheduler.add(self.every_three_days, callback))
+		self.clock.now = datetime(2012, 5, 1)
+		self.assertEquals(self.scheduler.run_pending(), 1)
+		self.assertEquals(self.fired, [date(2012, 4, 7)])
+		self.assertEquals(self.scheduler.get_next_occurrence(), None)
+	
+	def testRun(self):
+		self.scheduler.add(self.every_three_days, self.callback('a'))
+		self.scheduler.add(self.last_saturday, self.callback('b'))
+		self.scheduler.run(until=datetime(2012, 5, 1))
+		self.assertEquals(self.fired, [
+			('a', date(2012, 4, 7)),
+			('a', date(2012, 4, 10)),
+			('a', date(2012, 4, 13)),
+			('a', date(2012, 4, 16)),
+			('a', date(2012, 4, 19)),
+			('a', date(2012, 4, 22)),
+			('a', date(2012, 4, 25)),
+			('a', date(2012, 4, 28)),
+			('b', date(2012, 4, 28)),
+		])
+		self.assertEquals(self.clock.now, datetime(2012, 4, 28))
+		self.assertEquals(self.clock.sleeps[0], 2.5 * 24 * 60 * 60)
+	
+	def testRunWithoutTimers(self):
+		self.scheduler.run()
+		self.assertEquals(self.clock.sleeps, [])
+	
+	@unittest.skipIf(asyncio is None, 'asyncio is not available')
+	def testAttach(self):
+		loop = asyncio.new_event_loop()
+		try:
+			self.scheduler.attach(loop)
+			self.scheduler.add(self.every_three_days, self.callback('a'))
+			self.scheduler.add(self.last_saturday, self.callback('b'), start=date(2012, 4, 1))
+			loop.run_until_complete(asyncio.sleep(0.01))
+			self.assertEquals(self.fired, [('a', date(2012, 4, 7))])
+			self.assertTrue(self.scheduler._loop_handle is not None)
+			self.scheduler.detach()
+			self.assertTrue(self.scheduler._loop_handle is None)
+		finally:
+			loop.close()
+
+
+if __name__ == "__main__":
+	unittest.main()
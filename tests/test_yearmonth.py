@@ -1,6 +1,14 @@
 import unittest
+import copy
+import pickle
 from yearmonth import YearMonth
-from datetime import date
+from datetime import date, timedelta
+import yearmonth
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
 
 
 class TestYearMonth(unittest.TestCase):
@@ -41,8 +49,19 @@ class TestYearMonth(unittest.TestCase):
 			self.ym201112.month = 10
 		self.assertRaises(AttributeError, change_month)
 		
-		ym = YearMonth(2012, 1)
-		ym.day = 7  # Should not raise any exception 
+		def set_day():
+			YearMonth(2012, 1).day = 7
+		self.assertRaises(AttributeError, set_day)
+		
+		self.assertFalse(hasattr(self.ym201112, '__dict__'))
+	
+	def testInterning(self):
+		self.assertTrue(YearMonth(2012, 1) is YearMonth(2012, 1))
+		self.assertTrue(YearMonth.from_ordinal(2012 * 12) is self.ym201201)
+		self.assertTrue(YearMonth(2012, 6) is self.ym201206b)
+		
+		self.assertEquals(YearMonth(2500, 1), YearMonth(2500, 1))
+		self.assertEquals(hash(YearMonth(2500, 1)), hash(YearMonth(2500, 1)))
 	
 	def testFromString(self):
 		ym = YearMonth.from_string('2011-12')
@@ -71,6 +90,48 @@ class TestYearMonth(unittest.TestCase):
 		self.assertEquals(str(self.ym201201) , '2012-01')
 		self.assertEquals(str(self.ym201206a), '2012-06')
 
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def testBulkFromStrings(self):
+		strings = ['2011-12', '2012-01', '2012-06', '0001-01', '9999-12', '2012-06\n']
+		expected = [YearMonth.from_string(string) for string in strings]
+		self.assertEquals(YearMonth.from_strings(strings), expected)
+		self.assertEquals(list(YearMonth.ordinals_from_strings(strings)), [ym.to_ordinal() for ym in expected])
+		self.assertEquals(list(YearMonth.ordinals_from_strings(numpy.array(strings))), [ym.to_ordinal() for ym in expected])
+		self.assertEquals(list(YearMonth.ordinals_from_strings(numpy.array(strings, dtype='U'))), [ym.to_ordinal() for ym in expected])
+		self.assertEquals(YearMonth.ordinals_from_strings(numpy.array([['2012-01'], ['2012-02']])).shape, (2, 1))
+		self.assertEquals(len(YearMonth.ordinals_from_strings([])), 0)
+	
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def testBulkFromStringsValidation(self):
+		for invalid in ['2012-01-', '2012-1', '12-01', '2012/01', '2012-00', '2012-13', 'abcd-ef', '', ' 2012-01', '2012-01\n\n']:
+			self.assertRaises(ValueError, lambda: YearMonth.from_string(invalid))
+			self.assertRaises(ValueError, lambda: YearMonth.from_strings(['2012-01', invalid]))
+			self.assertRaises(ValueError, lambda: YearMonth.ordinals_from_strings(numpy.array(['2012-01', invalid])))
+	
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def testBulkToStrings(self):
+		yearmonths = [YearMonth(2011, 12), YearMonth(2012, 1), YearMonth(1, 1), YearMonth(9999, 12), YearMonth(10000, 1)]
+		self.assertEquals(YearMonth.to_strings(yearmonths), [str(ym) for ym in yearmonths])
+		self.assertEquals(list(YearMonth.ordinals_to_strings([ym.to_ordinal() for ym in yearmonths[:4]])), [str(ym) for ym in yearmonths[:4]])
+		ordinals = numpy.arange(0, 120000, 7)
+		self.assertEquals(list(YearMonth.ordinals_to_strings(ordinals)), [str(YearMonth.from_ordinal(ordinal)) for ordinal in ordinals])
+		self.assertEquals(list(YearMonth.ordinals_from_strings(YearMonth.ordinals_to_strings(ordinals))), list(ordinals))
+	
+	def testBulkWithoutNumpy(self):
+		strings = ['2011-12', '2012-01', '2012-06', '0001-01', '9999-12', '2012-06\n']
+		yearmonths = [YearMonth(2011, 12), YearMonth(2012, 1), YearMonth(1, 1), YearMonth(9999, 12), YearMonth(10000, 1)]
+		original_numpy = yearmonth.numpy
+		yearmonth.numpy = None
+		try:
+			self.assertEquals(YearMonth.from_strings(strings), [YearMonth.from_string(string) for string in strings])
+			self.assertEquals(YearMonth.from_strings(iter(strings)), [YearMonth.from_string(string) for string in strings])
+			self.assertRaises(ValueError, lambda: YearMonth.from_strings(['2012-01', '2012-13']))
+			self.assertEquals(YearMonth.to_strings(yearmonths), [str(ym) for ym in yearmonths])
+			self.assertRaises(ImportError, lambda: YearMonth.ordinals_from_strings(strings))
+			self.assertRaises(ImportError, lambda: YearMonth.ordinals_to_strings([0]))
+		finally:
+			yearmonth.numpy = original_numpy
+	
 	def testFromDate(self):
 		ym = YearMonth.from_date(date(2011, 12, 15))
 		self.assertEquals(ym, self.ym201112)
@@ -110,6 +171,41 @@ class TestYearMonth(unittest.TestCase):
 		dt = self.ym201206a.get_last_day()
 		self.assertEquals(dt, date(2012, 6, 30))
 	
+	def testDaysInMonthAndFirstWeekday(self):
+		for year in range(1, 2500) + [9999]:
+			for month in range(1, 13):
+				ym = YearMonth(year, month)
+				first_day = date(year, month, 1)
+				last_day = (ym + 1).get_first_day() - timedelta(days=1) if year < 9999 or month < 12 else date(9999, 12, 31)
+				self.assertEquals(yearmonth.days_in_month(year, month), last_day.day)
+				self.assertEquals(yearmonth.first_weekday(year, month), first_day.weekday())
+				self.assertEquals(ym.get_days_in_month(), last_day.day)
+				self.assertEquals(ym.get_first_weekday(), first_day.weekday())
+				self.assertEquals(ym.get_last_day(), last_day)
+		
+		self.assertTrue(yearmonth.is_leap_year(2000))
+		self.assertTrue(yearmonth.is_leap_year(2012))
+		self.assertFalse(yearmonth.is_leap_year(1900))
+		self.assertFalse(yearmonth.is_leap_year(2013))
+	
+	def testCycleTables(self):
+		lengths, weekdays = yearmonth.get_cycle_tables()
+		self.assertEquals(len(lengths), yearmonth.CYCLE_MONTHS)
+		self.assertEquals(len(weekdays), yearmonth.CYCLE_MONTHS)
+		for year in (1, 1600, 1999, 2012, 2399, 9999):
+			for month in range(1, 13):
+				position = YearMonth(year, month).to_ordinal() % yearmonth.CYCLE_MONTHS
+				self.assertEquals(lengths[position], yearmonth.days_in_month(year, month))
+				self.assertEquals(weekdays[position], date(year, month, 1).weekday())
+	
+	def testDayOrdinals(self):
+		for year in (1, 2, 399, 400, 401, 1600, 1999, 2000, 2012, 2399, 2400, 9999):
+			for month in range(1, 13):
+				ym = YearMonth(year, month)
+				self.assertEquals(yearmonth.first_day_ordinal(ym.to_ordinal()), ym.get_first_day().toordinal())
+				for day in (1, 15, ym.get_days_in_month()):
+					self.assertEquals(yearmonth.split_day_ordinal(date(year, month, day).toordinal()), (ym.to_ordinal(), day))
+	
 	def testGetDate(self):
 		dt = self.ym201112.get_date(7)
 		self.assertEquals(dt, date(2011, 12, 7))
@@ -243,8 +339,15 @@ class TestYearMonth(unittest.TestCase):
 		assertSum(self.ym201206a, -6, self.ym201112)
 		assertSum(self.ym201206a, -5, self.ym201201)
 		assertSum(self.ym201206a,  0, self.ym201206a)
+	
+	def testPickleAndCopy(self):
+		for ym in [self.ym201112, YearMonth(2512, 4), YearMonth(-1, 1)]:
+			for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+				self.assertEquals(pickle.loads(pickle.dumps(ym, protocol)), ym)
+			self.assertTrue(copy.copy(ym) is ym)
+			self.assertTrue(copy.deepcopy(ym) is ym)
+		self.assertTrue(pickle.loads(pickle.dumps(self.ym201112, 2)) is self.ym201112)
 
-		
 
 if __name__ == "__main__":
 	#import sys;sys.argv = ['', 'Test.testName']
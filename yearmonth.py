@@ -1,20 +1,138 @@
+from array import array
+from bisect import bisect_right
 from datetime import date, timedelta
 from functools import total_ordering
 import re
 
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+_STRING_PATTERN = re.compile(r'^(\d{4})-(\d{2})$')
+
+# NumPy string kind and code unit matching the native str type
+if str is bytes:
+	_STRING_KIND, _STRING_CODE_UNIT = 'S', 'u1'
+else:
+	_STRING_KIND, _STRING_CODE_UNIT = 'U', 'u4'
+
+# Bypasses the read-only __setattr__ of YearMonth
+_set_attribute = object.__setattr__
+
+# Year-months in this range are interned, so that each one is built only once
+_INTERNED_ORDINALS = (1900 * 12, 2200 * 12)
+_interned = {}
+
+# Indexed by month; February is adjusted for leap years
+_DAYS_IN_MONTH = (None, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_DAYS_BEFORE_MONTH = (None, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+
+def _require_numpy():
+	if numpy is None:
+		raise ImportError('NumPy is required for the bulk operations')
+
+
+def is_leap_year(year):
+	return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year, month):
+	if month == 2 and is_leap_year(year):
+		return 29
+	return _DAYS_IN_MONTH[month]
+
+
+# The Gregorian calendar repeats itself, weekdays included, every 400 years
+CYCLE_MONTHS = 400 * 12
+_CYCLE_START_YEAR = 2000
+_cycle_tables = None
+
+
+def get_cycle_tables():
+	# Days in month and first weekday of each month in the 400-year cycle,
+	# indexed by the month ordinal modulo CYCLE_MONTHS
+	global _cycle_tables
+	if _cycle_tables is None:
+		lengths = array('b')
+		weekdays = array('b')
+		for ordinal in range(CYCLE_MONTHS):
+			year = _CYCLE_START_YEAR + ordinal // 12
+			month = ordinal % 12 + 1
+			lengths.append(days_in_month(year, month))
+			weekdays.append(first_weekday(year, month))
+		_cycle_tables = (lengths, weekdays)
+	return _cycle_tables
+
+
+_CYCLE_DAYS = 146097
+_CYCLE_START_DAY_ORDINAL = date(_CYCLE_START_YEAR, 1, 1).toordinal()
+_cycle_month_offsets = None
+
+
+def get_cycle_month_offsets():
+	# Days from the start of the 400-year cycle to the first day of each month
+	global _cycle_month_offsets
+	if _cycle_month_offsets is None:
+		offsets = array('i')
+		offset = 0
+		for length in get_cycle_tables()[0]:
+			offsets.append(offset)
+			offset += length
+		_cycle_month_offsets = offsets
+	return _cycle_month_offsets
+
+
+def first_day_ordinal(ym_ordinal):
+	# Proleptic day ordinal, as in date.toordinal(), of the first day of a month
+	cycle, position = divmod(ym_ordinal - _CYCLE_START_YEAR * 12, CYCLE_MONTHS)
+	return _CYCLE_START_DAY_ORDINAL + cycle * _CYCLE_DAYS + get_cycle_month_offsets()[position]
+
+
+def split_day_ordinal(day_ordinal):
+	# Month ordinal and day of month of a proleptic day ordinal
+	cycle, offset = divmod(day_ordinal - _CYCLE_START_DAY_ORDINAL, _CYCLE_DAYS)
+	offsets = get_cycle_month_offsets()
+	position = bisect_right(offsets, offset) - 1
+	return _CYCLE_START_YEAR * 12 + cycle * CYCLE_MONTHS + position, offset - offsets[position] + 1
+
+
+def first_weekday(year, month):
+	# Days elapsed since 0001-01-01, which was a Monday (weekday 0)
+	y = year - 1
+	days = y * 365 + y // 4 - y // 100 + y // 400 + _DAYS_BEFORE_MONTH[month]
+	if month > 2 and is_leap_year(year):
+		days += 1
+	return days % 7
+
 
 @total_ordering
 class YearMonth(object):
-	def __init__(self, year, month):
+	__slots__ = ('year', 'month')
+	
+	def __new__(cls, year, month):
 		if month < 1 or month > 12:
 			raise ValueError('Invalid month: ' + str(month))
 		
-		self.year = year
-		self.month = month
+		ordinal = year * 12 + (month - 1)
+		intern = cls is YearMonth and _INTERNED_ORDINALS[0] <= ordinal < _INTERNED_ORDINALS[1]
+		if intern:
+			self = _interned.get(ordinal)
+			if self is not None:
+				return self
+		
+		self = super(YearMonth, cls).__new__(cls)
+		_set_attribute(self, 'year', year)
+		_set_attribute(self, 'month', month)
+		if intern:
+			_interned[ordinal] = self
+		return self
 	
 	@staticmethod
 	def from_string(string):
-		m = re.match(r'^(\d{4})-(\d{2})$', string)
+		m = _STRING_PATTERN.match(string)
 		if m is None:
 			raise ValueError('Invalid YearMonth string initialization: ' + repr(string))
 		else:
@@ -22,6 +140,78 @@ class YearMonth(object):
 			month = int(m.group(2))
 			return YearMonth(year, month)
 	
+	@staticmethod
+	def from_strings(strings):
+		if numpy is None:
+			return [YearMonth.from_string(string) for string in strings]
+		from_ordinal = YearMonth.from_ordinal
+		return [from_ordinal(ordinal) for ordinal in YearMonth.ordinals_from_strings(strings).ravel().tolist()]
+	
+	@staticmethod
+	def ordinals_from_strings(strings):
+		_require_numpy()
+		original = numpy.asarray(strings)
+		strings = original
+		if strings.dtype.kind not in 'SU':
+			strings = strings.astype(_STRING_KIND)
+		flat_original = original.ravel()
+		flat = numpy.ascontiguousarray(strings.ravel())
+		
+		code_unit = numpy.dtype('u1' if flat.dtype.kind == 'S' else 'u4')
+		width = flat.dtype.itemsize // code_unit.itemsize
+		if width < 7:
+			ordinals = numpy.zeros(len(flat), dtype=numpy.int64)
+			valid = numpy.zeros(len(flat), dtype=bool)
+		else:
+			codes = flat.view(code_unit).reshape(len(flat), width)
+			# Unsigned subtraction wraps around, so anything below '0' is also above 9
+			digits = codes[:, [0, 1, 2, 3, 5, 6]] - code_unit.type(ord('0'))
+			valid = (digits <= 9).all(axis=1) & (codes[:, 4] == ord('-'))
+			if width > 7:
+				# The pattern's '$' also matches before a trailing newline
+				padded = (codes[:, 8:] == 0).all(axis=1)
+				valid &= padded & ((codes[:, 7] == 0) | (codes[:, 7] == ord('\n')))
+			digits = digits.astype(numpy.int64)
+			years = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+			months = digits[:, 4] * 10 + digits[:, 5]
+			valid &= (months >= 1) & (months <= 12)
+			ordinals = years * 12 + (months - 1)
+		
+		# Anything the fast path did not accept goes through from_string(),
+		# which either raises the usual ValueError or accepts it
+		for index in numpy.flatnonzero(~valid):
+			ordinals[index] = YearMonth.from_string(flat_original[index]).to_ordinal()
+		
+		return ordinals.reshape(original.shape)
+	
+	@staticmethod
+	def to_strings(yearmonths):
+		if numpy is None:
+			return [str(ym) for ym in yearmonths]
+		ordinals = [ym.to_ordinal() for ym in yearmonths]
+		return YearMonth.ordinals_to_strings(ordinals).tolist()
+	
+	@staticmethod
+	def ordinals_to_strings(ordinals):
+		_require_numpy()
+		ordinals = numpy.asarray(ordinals, dtype=numpy.int64)
+		years, months = numpy.divmod(ordinals.ravel(), 12)
+		months += 1
+		if ((years < 0) | (years > 9999)).any():
+			strings = [str(YearMonth.from_ordinal(ordinal)) for ordinal in ordinals.ravel().tolist()]
+			return numpy.array(strings, dtype=_STRING_KIND).reshape(ordinals.shape)
+		
+		codes = numpy.empty((len(years), 7), dtype=_STRING_CODE_UNIT)
+		codes[:, 0] = years // 1000
+		codes[:, 1] = years // 100 % 10
+		codes[:, 2] = years // 10 % 10
+		codes[:, 3] = years % 10
+		codes[:, 5] = months // 10
+		codes[:, 6] = months % 10
+		codes += ord('0')
+		codes[:, 4] = ord('-')
+		return codes.view(_STRING_KIND + '7').reshape(ordinals.shape)
+	
 	@staticmethod
 	def from_date(date):
 		return YearMonth(date.year, date.month)
@@ -33,9 +223,19 @@ class YearMonth(object):
 		return YearMonth(year, month)
 	
 	def __setattr__(self, attr, value):
-		if attr in ('year', 'month') and hasattr(self, attr):
-			raise AttributeError('Attribute ' + attr + ' cannot be set')
-		return super(YearMonth, self).__setattr__(attr, value)
+		raise AttributeError('Attribute ' + attr + ' cannot be set')
+	
+	def __delattr__(self, attr):
+		raise AttributeError('Attribute ' + attr + ' cannot be deleted')
+	
+	def __reduce__(self):
+		return (self.__class__, (self.year, self.month))
+	
+	def __copy__(self):
+		return self
+	
+	def __deepcopy__(self, memo):
+		return self
 	
 	def to_ordinal(self):
 		return self.year * 12 + (self.month - 1)
@@ -44,7 +244,13 @@ class YearMonth(object):
 		return self.get_date(1)
 	
 	def get_last_day(self):
-		return (self + 1).get_first_day() - timedelta(days=1)
+		return self.get_date(days_in_month(self.year, self.month))
+	
+	def get_days_in_month(self):
+		return days_in_month(self.year, self.month)
+	
+	def get_first_weekday(self):
+		return first_weekday(self.year, self.month)
 	
 	def get_date(self, day):
 		return date(self.year, self.month, day)